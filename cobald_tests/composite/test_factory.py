@@ -0,0 +1,41 @@
+from ..mock.pool import FullMockPool
+
+from cobald.composite.factory import FactoryPool
+
+
+def spawn():
+    return FullMockPool(demand=1, supply=1)
+
+
+class TestFactoryPool(object):
+    def test_grow(self):
+        pool = FactoryPool(factory=spawn)
+        pool._grow(target=3)
+        assert len(pool.children) == 3
+        assert pool.supply == 3
+        assert pool.draining == 0
+
+    def test_drain(self):
+        pool = FactoryPool(factory=spawn)
+        pool._grow(target=3)
+        pool._shrink(target=1)
+        assert len(pool.children) == 3
+        assert pool.draining == 2
+        # children shutting down still contribute until they report no supply
+        assert pool.supply == 3
+        drained, draining = [child for child in pool.children if child.demand == 0]
+        drained.supply = 0
+        pool._evict_children()
+        assert pool.draining == 1
+        assert drained not in pool.children
+        assert draining in pool.children
+
+    def test_drain_timeout(self):
+        pool = FactoryPool(factory=spawn, drain_timeout=0)
+        pool._grow(target=3)
+        pool._shrink(target=1)
+        assert pool.draining == 2
+        pool._evict_children()
+        assert pool.draining == 0
+        assert len(pool.children) == 1
+        assert pool.supply == 1
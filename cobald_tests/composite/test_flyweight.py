@@ -0,0 +1,158 @@
+import pytest
+
+from cobald.composite.flyweight import (
+    FlyweightFactoryPool,
+    DroneView,
+    FREE,
+    ACTIVE,
+    RELEASED,
+)
+
+
+class RowProvider(object):
+    """Provider of resources for the rows of a :py:class:`FlyweightFactoryPool`"""
+
+    def __init__(self):
+        self.started = []
+        self.stopped = []
+
+    def start(self, drone: DroneView):
+        self.started.append(drone.row)
+
+    def stop(self, drone: DroneView):
+        self.stopped.append(drone.row)
+
+    def pool(self, **kwargs) -> FlyweightFactoryPool:
+        return FlyweightFactoryPool(start=self.start, stop=self.stop, **kwargs)
+
+    def tick(self, pool: FlyweightFactoryPool):
+        """Boot all started and drain all stopped resources"""
+        for row in self.started:
+            pool.supplies[row], pool.utilisations[row] = pool.demands[row], 1.0
+        for row in self.stopped:
+            pool.supplies[row] = pool.utilisations[row] = 0.0
+        self.started, self.stopped = [], []
+
+
+class TestFlyweightFactoryPool(object):
+    def test_init(self):
+        pool = RowProvider().pool(drone_demand=2)
+        assert pool.demand == 0
+        assert pool.supply == 0
+        assert pool.children == []
+        with pytest.raises(ValueError):
+            RowProvider().pool(drone_demand=0)
+
+    def test_grow(self):
+        pool = RowProvider().pool(drone_demand=2)
+        pool.demand = 5
+        pool.adjust()
+        assert len(pool.children) == 3
+        assert all(isinstance(child, DroneView) for child in pool.children)
+        assert sum(child.demand for child in pool.children) == 6
+        # children that are not yet ready do not change the pool
+        pool.adjust()
+        assert len(pool.children) == 3
+
+    def test_aggregate(self):
+        pool = RowProvider().pool()
+        pool.demand = 3
+        pool.adjust()
+        first, second, third = pool.children
+        first.supply, first.utilisation, first.allocation = 1, 0.5, 1.0
+        second.supply, second.utilisation, second.allocation = 1, 1.0, 1.0
+        assert pool.supply == 2
+        assert pool.utilisation == 0.75
+        assert pool.allocation == 1.0
+        assert third.supply == 0
+
+    def test_shrink(self):
+        pool = RowProvider().pool()
+        pool.demand = 3
+        pool.adjust()
+        for child, utilisation in zip(pool.children, (0.5, 1.0, 0.1)):
+            child.supply, child.utilisation = 1, utilisation
+        pool.demand = 2
+        pool.adjust()
+        # the least utilised child is released
+        assert list(pool.rows(ACTIVE)) == [0, 1]
+        assert list(pool.rows(RELEASED)) == [2]
+        assert pool.demands[2] == 0
+        # rows are only reused once their child stops supplying
+        pool.demand = 3
+        pool.adjust()
+        assert len(pool.states) == 4
+        pool.supplies[2] = 0
+        pool.demand = 4
+        pool.adjust()
+        assert len(pool.states) == 4
+        assert list(pool.rows(ACTIVE)) == [0, 1, 2, 3]
+
+    def test_reap(self):
+        pool = RowProvider().pool()
+        pool.demand = 2
+        pool.adjust()
+        # children may disable themselves
+        pool.children[0].demand = 0
+        pool.adjust()
+        assert pool.states[0] == RELEASED
+        assert list(pool.rows(ACTIVE)) == [1, 2]
+
+    def test_compact(self):
+        pool = RowProvider().pool()
+        pool.demand = 100000
+        pool.adjust()
+        assert len(pool.states) == 100000
+        assert pool.demands.itemsize * len(pool.demands) == 800000
+
+    def test_stale_view(self):
+        pool = RowProvider().pool()
+        pool.demand = 1
+        pool.adjust()
+        (view,) = pool.children
+        view.supply = 1.0
+        # release the child and drain its resources to recycle the row
+        pool.demand = 0
+        pool.adjust()
+        view.supply = 0.0
+        pool.demand = 1
+        pool.adjust()
+        (child,) = pool.children
+        assert child.row == view.row
+        assert view.stale and not child.stale
+        # the view of the previous child must not modify the new child
+        view.demand = 0
+        view.supply = 5.0
+        assert view.demand == view.supply == 0
+        assert child.demand == 1 and child.supply == 0
+
+    def test_provider(self):
+        provider = RowProvider()
+        pool = provider.pool(drone_demand=2)
+        pool.demand = 6
+        pool.adjust()
+        assert provider.started == [0, 1, 2]
+        provider.tick(pool)
+        assert pool.supply == 6
+        # shrinking stops resources of released rows
+        pool.demand = 2
+        pool.adjust()
+        assert provider.stopped == [0, 1]
+        assert pool.supply == 6
+        provider.tick(pool)
+        assert pool.supply == 2
+        # drained rows are recycled when growing again
+        pool.demand = 6
+        pool.adjust()
+        assert sorted(provider.started) == [0, 1]
+        assert len(pool.states) == 3
+        provider.tick(pool)
+        # draining stops all resources
+        pool.demand = 0
+        pool.adjust()
+        assert sorted(provider.stopped) == [0, 1, 2]
+        provider.tick(pool)
+        pool.adjust()
+        assert pool.supply == 0
+        assert pool.children == []
+        assert list(pool.rows(FREE)) == [0, 1, 2]
@@ -4,6 +4,7 @@ import sys
 import pytest
 
 from collections import Counter
+from cobald.daemon.config import mapping
 from cobald.daemon.config.mapping import Translator, ConfigurationError
 
 
@@ -55,6 +56,23 @@ class TestTranslate(object):
         loaded_module = translator.load_name(__name__)
         assert sys.modules[__name__] is loaded_module
 
+    def test_load_name_cached(self, monkeypatch):
+        loaded, _resolve_name = [], mapping._resolve_name
+
+        def resolve_name(absolute_name):
+            loaded.append(absolute_name)
+            return _resolve_name(absolute_name)
+
+        monkeypatch.setattr(mapping, "_loaded_names", {})
+        monkeypatch.setattr(mapping, "_resolve_name", resolve_name)
+        for _ in range(2):
+            constructs = Translator().translate_hierarchy(
+                [{"__type__": Construct.fqdn, "index": index} for index in range(5)]
+            )
+            indices = [construct.kwargs["index"] for construct in constructs]
+            assert indices == list(range(5))
+        assert loaded == [Construct.fqdn]
+
     def test_construct(self):
         translator = Translator()
         for args in ((), [5, 2e7, -2, 27], range(5)):
@@ -134,6 +152,32 @@ class TestTranslate(object):
             )
         assert err.value.where == "test_translate_error[1].foo"
 
+    def test_translate_deep(self):
+        translator = Translator()
+        depth = sys.getrecursionlimit() * 2
+        structure = nested = []
+        for _ in range(depth):
+            nested.append({"foo": []})
+            nested = nested[0]["foo"]
+        nested.append({"__type__": raises.fqdn})
+        with pytest.raises(ConfigurationError) as err:
+            translator.translate_hierarchy(structure, where="test_translate_deep")
+        assert err.value.where == "test_translate_deep" + "[0].foo" * depth + "[0]"
+
+    def test_translate_override(self):
+        class UpperTranslator(Translator):
+            def translate_hierarchy(self, structure, *, where="", **construct_kwargs):
+                if isinstance(structure, str):
+                    return structure.upper()
+                return super().translate_hierarchy(
+                    structure, where=where, **construct_kwargs
+                )
+
+        translator = UpperTranslator()
+        assert translator.translate_hierarchy({"foo": ["bar", {"qux": "baz"}]}) == {
+            "foo": ["BAR", {"qux": "BAZ"}]
+        }
+
     def test_lookup_failure(self):
         translator = Translator()
         with pytest.raises(ConfigurationError):
@@ -0,0 +1,35 @@
+from tempfile import NamedTemporaryFile
+
+import pytest
+
+from cobald.daemon.config.mapping import ConfigurationError, SectionPlugin
+from cobald.daemon.config.yaml import load_configuration
+from cobald.daemon.plugins import PluginRequirements
+
+
+PLUGINS = (
+    SectionPlugin("pipeline", lambda data: data, PluginRequirements(required=True)),
+    SectionPlugin("extra", lambda data: data, PluginRequirements()),
+)
+
+
+def load_documents(content: str):
+    with NamedTemporaryFile(mode="w+", suffix=".yaml") as config:
+        config.write(content)
+        config.flush()
+        return load_configuration(config.name, plugins=PLUGINS)
+
+
+def test_load_documents():
+    content = load_documents(
+        "pipeline:\n  first: [1, 2]\n" "---\n" "pipeline:\n  second: [3]\nextra: 4\n"
+    )
+    assert content[PLUGINS[0]] == {"first": [1, 2], "second": [3]}
+    assert content[PLUGINS[1]] == 4
+
+
+def test_load_documents_conflict():
+    with pytest.raises(ConfigurationError):
+        load_documents("pipeline:\n  first: [1, 2]\nextra: 3\n" "---\n" "extra: 4\n")
+    with pytest.raises(ConfigurationError):
+        load_documents("pipeline: {}\n" "---\n" "- 1\n")
@@ -0,0 +1,59 @@
+from tempfile import NamedTemporaryFile
+import io
+
+import pytest
+
+from cobald.daemon.config.mapping import ConfigurationError
+from cobald.daemon.core.check import check_configuration, check
+from cobald.daemon.runners.service import ServiceUnit
+
+from .test_config import write_config
+
+
+VALID = """
+pipeline:
+    first:
+        - !LinearController
+          low_utilisation: 0.9
+          high_allocation: 1.1
+        - __type__: cobald_tests.mock.pool.MockPool
+    second:
+        - __type__: cobald_tests.mock.pool.MockPool
+"""
+
+
+class TestCheck:
+    def test_check(self):
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(config.name, VALID)
+            with ServiceUnit.collect() as units:
+                timings = list(check_configuration(config.name))
+            assert [(timing.phase, timing.depth) for timing in timings] == [
+                ("parse", 0),
+                ("plugins", 0),
+                ("section pipeline", 0),
+                ("pipeline first", 1),
+                ("pipeline second", 1),
+            ]
+            assert all(timing.seconds >= 0 for timing in timings)
+            assert units and all(unit.cancelled for unit in units)
+
+    def test_check_invalid(self):
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(config.name, VALID + "\nunknown: 1\n")
+            timings = check_configuration(config.name)
+            assert next(timings).phase == "parse"
+            assert next(timings).phase == "plugins"
+            with pytest.raises(ConfigurationError):
+                next(timings)
+
+    def test_report(self):
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(config.name, VALID)
+            output = io.StringIO()
+            assert check(config.name, stream=output) == 0
+            assert "pipeline second" in output.getvalue()
+            write_config(config.name, "pipeline: [")
+            output = io.StringIO()
+            assert check(config.name, stream=output) != 0
+            assert "is invalid" in output.getvalue()
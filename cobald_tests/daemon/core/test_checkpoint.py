@@ -0,0 +1,84 @@
+import json
+from tempfile import TemporaryDirectory
+import os
+
+import pytest
+
+from cobald.daemon.core.checkpoint import (
+    read_checkpoint,
+    write_checkpoint,
+    pipeline_sections,
+    Checkpointer,
+)
+from cobald.decorator.standardiser import Standardiser
+from cobald.decorator.buffer import Buffer
+from cobald.composite.uniform import UniformComposite
+from cobald.composite.factory import FactoryPool
+
+from ...mock.pool import FullMockPool
+
+
+def make_pipeline():
+    composite = UniformComposite(Buffer(FullMockPool()), Standardiser(FullMockPool()))
+    return [Standardiser(composite), composite]
+
+
+class TestCheckpoint:
+    def test_sections(self):
+        pipeline = make_pipeline()
+        assert pipeline_sections(pipeline) == {"pipeline": pipeline}
+        assert pipeline_sections({"first": pipeline}) == {"first": pipeline}
+
+    def test_roundtrip(self):
+        """Restore the state of a pipeline from a checkpoint"""
+        with TemporaryDirectory() as base_path:
+            path = os.path.join(base_path, "checkpoint.json")
+            assert read_checkpoint(path, {"pipeline": make_pipeline()}) == 0
+            pipeline = make_pipeline()
+            pipeline[0].demand = 8
+            write_checkpoint(path, {"pipeline": pipeline})
+            restored = make_pipeline()
+            assert read_checkpoint(path, {"pipeline": restored}) == 2
+            assert restored[0].demand == 8
+            assert restored[1].demand == 8
+            buffer, standardiser = restored[1].children
+            assert buffer.demand == standardiser.demand == 4
+
+    def test_mismatch(self):
+        """Ignore checkpoints of different pipelines"""
+        with TemporaryDirectory() as base_path:
+            path = os.path.join(base_path, "checkpoint.json")
+            pipeline = make_pipeline()
+            pipeline[0].demand = 8
+            write_checkpoint(path, {"pipeline": pipeline})
+            other = [Buffer(FullMockPool())]
+            assert read_checkpoint(path, {"pipeline": other}) == 0
+            assert read_checkpoint(path, {"other": make_pipeline()}) == 0
+
+    def test_factory(self):
+        """Restore the demand of a FactoryPool"""
+        with TemporaryDirectory() as base_path:
+            path = os.path.join(base_path, "checkpoint.json")
+            pool = FactoryPool(factory=FullMockPool)
+            pool.demand = 5
+            write_checkpoint(path, {"pipeline": [pool]})
+            restored = FactoryPool(factory=FullMockPool)
+            assert read_checkpoint(path, {"pipeline": [restored]}) == 1
+            assert restored.demand == 5
+
+    def test_version(self):
+        with TemporaryDirectory() as base_path:
+            path = os.path.join(base_path, "checkpoint.json")
+            with open(path, "w") as checkpoint_stream:
+                json.dump({"version": -1, "pipelines": {}}, checkpoint_stream)
+            with pytest.raises(ValueError):
+                read_checkpoint(path, {})
+
+    def test_checkpointer(self):
+        with TemporaryDirectory() as base_path:
+            path = os.path.join(base_path, "checkpoint.json")
+            pipeline = make_pipeline()
+            checkpointer = Checkpointer(path, lambda: {"pipeline": pipeline})
+            checkpointer.checkpoint()
+            assert read_checkpoint(path, {"pipeline": make_pipeline()}) == 2
+            assert os.listdir(base_path) == ["checkpoint.json"]
@@ -1,13 +1,31 @@
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+import logging
+import os
+import threading
+import yaml
 
 import pytest
 import copy
 
-from cobald.daemon.config.mapping import ConfigurationError
-from cobald.daemon.core.config import load, COBalDLoader, yaml_constructor
+from cobald.daemon.config.mapping import ConfigurationError, SectionPlugin
+from cobald.daemon.plugins import PluginRequirements
+from cobald.daemon.core import config as config_module
+from cobald.daemon.core.config import (
+    load,
+    COBalDLoader,
+    yaml_constructor,
+    ReloadableConfiguration,
+    add_constructor_plugins,
+    LazyConstructorPlugin,
+    TemplateInstance,
+    LivePipeline,
+    _compose,
+    _split_root,
+)
 from cobald.controller.linear import LinearController
+from cobald.composite.factory import FactoryPool
 
-from ...mock.pool import MockPool
+from ...mock.pool import MockPool, FullMockPool
 
 
 # register test pool as safe for YAML configurations
@@ -37,6 +55,19 @@ COBalDLoader.add_constructor(
 )
 
 
+class ThreadTracker(MockPool):
+    """Helper to track the threads constructing pools"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.thread = threading.current_thread()
+
+
+COBalDLoader.add_constructor(
+    tag="!ThreadTracker", constructor=yaml_constructor(ThreadTracker)
+)
+
+
 def get_config_section(config: dict, section: str):
     return next(
         content for plugin, content in config.items() if plugin.section == section
@@ -253,3 +284,535 @@ class TestYamlConfig:
                 assert args == ()
                 assert kwargs["top"] == "top level value"
                 assert kwargs["nested"] == [{"leaf": "leaf level value"}]
+
+    def test_load_named_pipelines(self):
+        """Load a YAML config with several named pipelines"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            with open(config.name, "w") as write_stream:
+                write_stream.write(
+                    """
+                    pipeline:
+                        first:
+                            - !LinearController
+                              low_utilisation: 0.9
+                              high_allocation: 1.1
+                            - !MockPool
+                        second:
+                            - !MockPool
+                    """
+                )
+            with load(config.name) as config:
+                pipelines = get_config_section(config, "pipeline")
+                assert isinstance(pipelines["first"][0], LinearController)
+                assert isinstance(pipelines["first"][1], MockPool)
+                assert isinstance(pipelines["second"][0], MockPool)
+
+
+class TestYamlLoader:
+    @pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml not available")
+    def test_libyaml(self):
+        """Use the compiled loader if libyaml is available"""
+        assert issubclass(COBalDLoader, yaml.CSafeLoader)
+
+
+class TestConstructorPlugins:
+    def test_lazy(self):
+        """Load constructor plugins only when their tag is used"""
+
+        class PluginLoader(yaml.SafeLoader):
+            pass
+
+        group = "cobald.config.yaml_constructors"
+        add_constructor_plugins(group, PluginLoader)
+        constructors = PluginLoader.yaml_constructors
+        assert isinstance(constructors["!Buffer"], LazyConstructorPlugin)
+        assert isinstance(constructors["!LinearController"], LazyConstructorPlugin)
+        data = yaml.load("!__yaml_tag_test {a: 1}", Loader=PluginLoader)
+        assert data == ((), {"a": 1})
+        resolved = PluginLoader.yaml_constructors["!__yaml_tag_test"]
+        assert not isinstance(resolved, LazyConstructorPlugin)
+        assert isinstance(constructors["!Buffer"], LazyConstructorPlugin)
+        # adding plugins again keeps loaded plugins
+        add_constructor_plugins(group, PluginLoader)
+        assert PluginLoader.yaml_constructors["!__yaml_tag_test"] is resolved
+        assert yaml.load("!__yaml_tag_test [1]", Loader=PluginLoader) == ((1,), {})
+
+
+class TestConcurrentConfig:
+    def test_load_concurrent(self):
+        """Load independent pipelines concurrently"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    first:
+                        - !LinearController
+                          low_utilisation: 0.9
+                          high_allocation: 1.1
+                        - !ThreadTracker
+                    second:
+                        - !ThreadTracker
+                """,
+            )
+            with load(config.name, workers=2) as config:
+                pipelines = get_config_section(config, "pipeline")
+                assert isinstance(pipelines["first"][0], LinearController)
+                assert pipelines["first"][0].target is pipelines["first"][1]
+                for pipeline in pipelines.values():
+                    assert pipeline[-1].thread is not threading.current_thread()
+
+    def test_load_shared(self):
+        """Load pipelines sharing anchors serially"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    first:
+                        - &shared !ThreadTracker
+                    second:
+                        - !LinearController
+                          low_utilisation: 0.9
+                          high_allocation: 1.1
+                        - *shared
+                """,
+            )
+            with load(config.name, workers=2) as config:
+                pipelines = get_config_section(config, "pipeline")
+                assert pipelines["first"][0] is pipelines["second"][1]
+                assert pipelines["first"][0].thread is threading.current_thread()
+
+    def test_load_concurrent_invalid(self):
+        """Load invalid pipelines concurrently"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    first:
+                        - !LinearController
+                          low_utilisation: 0.9
+                          foo: 0
+                        - !ThreadTracker
+                    second:
+                        - !ThreadTracker
+                """,
+            )
+            with pytest.raises(TypeError):
+                with load(config.name, workers=2):
+                    assert False
+
+    def test_reload_concurrent(self):
+        """Reload changed pipelines concurrently"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    first:
+                        - !ThreadTracker
+                    second:
+                        - !ThreadTracker
+                """,
+            )
+            configuration = ReloadableConfiguration(config.name, workers=2)
+            configuration.reload()
+            for pipeline in configuration.pipelines.values():
+                assert pipeline.content[0].thread is not threading.current_thread()
+
+
+class TestPipelineTemplates:
+    def test_expand(self):
+        """Expand a pipeline template for every combination of parameters"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    plain:
+                        - !MockPool
+                    site-${site}-${index}:
+                        template:
+                            - !LinearController
+                              low_utilisation: 0.${index}
+                              high_allocation: 1.1
+                              rate: ${index}
+                            - !MockPool
+                        matrix:
+                            site: [KIT, DESY]
+                            index: {start: 1, stop: 3}
+                """,
+            )
+            with load(config.name) as content:
+                pipelines = get_config_section(content, "pipeline")
+                assert list(pipelines) == [
+                    "plain",
+                    "site-KIT-1",
+                    "site-KIT-2",
+                    "site-DESY-1",
+                    "site-DESY-2",
+                ]
+                assert pipelines["site-KIT-2"][0].low_utilisation == 0.2
+                assert pipelines["site-KIT-2"][0].rate == 2
+                assert pipelines["site-KIT-1"][1] is not pipelines["site-DESY-1"][1]
+
+    def test_reload_instances(self):
+        """Expand template instances only when their pipeline is constructed"""
+        template = """
+        pipeline:
+            rate-${rate}:
+                template:
+                    - !LinearController
+                      low_utilisation: 0.9
+                      high_allocation: 1.1
+                      rate: $rate
+                    - !MockPool
+                matrix:
+                    rate: [%s]
+        """
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(config.name, template % "1, 2")
+            _, pipeline_node = _split_root(_compose(config.name))
+            instances = [instance for _, instance in pipeline_node.value]
+            assert all(isinstance(node, TemplateInstance) for node in instances)
+            assert instances[0].template is instances[1].template
+            configuration = ReloadableConfiguration(config.name)
+            configuration.reload()
+            before = dict(configuration.pipelines)
+            write_config(config.name, template % "1, 2, 3")
+            configuration.reload()
+            assert configuration.pipelines.keys() == {"rate-1", "rate-2", "rate-3"}
+            assert configuration.pipelines["rate-1"] is before["rate-1"]
+            assert configuration.pipelines["rate-3"].content[0].rate == 3
+
+    @pytest.mark.parametrize(
+        "name, matrix",
+        [
+            ("site", "site: [KIT, DESY]"),
+            ("site-${index}", "site: [KIT, DESY]"),
+            ("site-${site}", "site: KIT"),
+            ("site-${site}", "site: {begin: 1, stop: 3}"),
+        ],
+    )
+    def test_invalid(self, name, matrix):
+        """Reject templates with ambiguous names, placeholders or parameters"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    %s:
+                        template:
+                            - !MockPool
+                        matrix:
+                            %s
+                """
+                % (name, matrix),
+            )
+            with pytest.raises(ConfigurationError):
+                with load(config.name):
+                    pass
+
+
+def write_config(path: str, content: str):
+    with open(path, "w") as write_stream:
+        write_stream.write(content)
+
+
+class TestReloadableConfig:
+    def test_reload(self):
+        """Reload only changed pipelines of a YAML config"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    same:
+                        - !LinearController
+                          low_utilisation: 0.9
+                          high_allocation: 1.1
+                        - !MockPool
+                    changed:
+                        - !LinearController
+                          low_utilisation: 0.9
+                          high_allocation: 1.1
+                        - !MockPool
+                    removed:
+                        - !LinearController
+                          low_utilisation: 0.9
+                          high_allocation: 1.1
+                        - !MockPool
+                """,
+            )
+            configuration = ReloadableConfiguration(config.name)
+            configuration.reload()
+            before = dict(configuration.pipelines)
+            assert before.keys() == {"same", "changed", "removed"}
+            assert all(len(pipeline.units) == 1 for pipeline in before.values())
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    same:
+                        - !LinearController
+                          low_utilisation: 0.9
+                          high_allocation: 1.1
+                        - !MockPool
+                    changed:
+                        - !LinearController
+                          low_utilisation: 0.5
+                          high_allocation: 1.1
+                        - !MockPool
+                    added:
+                        - !MockPool
+                """,
+            )
+            configuration.reload()
+            after = configuration.pipelines
+            assert after.keys() == {"same", "changed", "added"}
+            assert after["same"] is before["same"]
+            assert not before["same"].units[0].cancelled
+            assert after["changed"].content[0].low_utilisation == 0.5
+            assert before["changed"].units[0].cancelled
+            assert before["removed"].units[0].cancelled
+            assert not after["changed"].units[0].cancelled
+
+    def test_reload_invalid(self):
+        """Keep running pipelines if a reloaded YAML config is invalid"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    - !LinearController
+                      low_utilisation: 0.9
+                      high_allocation: 1.1
+                    - !MockPool
+                """,
+            )
+            configuration = ReloadableConfiguration(config.name)
+            configuration.reload()
+            before = dict(configuration.pipelines)
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    - !LinearController
+                      low_utilisation: 0.9
+                      foo: 0
+                    - !MockPool
+                """,
+            )
+            with pytest.raises(TypeError):
+                configuration.reload()
+            assert configuration.pipelines == before
+            assert not before["pipeline"].units[0].cancelled
+
+    def test_reload_children(self):
+        """Disable pools and their children of cancelled pipelines"""
+        factory = FactoryPool(factory=lambda: FullMockPool(demand=1, supply=1))
+        factory._grow(target=2)
+        pool = FullMockPool(demand=1, supply=1)
+        controller = LinearController(pool, low_utilisation=0.9, high_allocation=1.1)
+        pipeline = LivePipeline(None, {"a": [factory], "b": [controller, pool]}, [])
+        children = factory.children
+        assert len(children) == 2
+        pipeline.cancel()
+        assert factory.demand == 0
+        assert pool.demand == 0
+        assert all(child.demand == 0 for child in children)
+
+    def test_reload_late_sections(self, monkeypatch):
+        """Apply plugins ordered after pipelines once pipelines are constructed"""
+        seen_pipelines = []
+        plugins = config_module._load_yaml_plugins()
+        monkeypatch.setattr(
+            config_module,
+            "_load_yaml_plugins",
+            lambda: (
+                *plugins,
+                SectionPlugin(
+                    "late",
+                    lambda data: seen_pipelines.append(dict(configuration.pipelines)),
+                    PluginRequirements(after=frozenset({"pipeline"})),
+                ),
+            ),
+        )
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                late: 1
+                pipeline:
+                    - !MockPool
+                """,
+            )
+            configuration = ReloadableConfiguration(config.name)
+            configuration.reload()
+            assert len(seen_pipelines) == 1
+            assert seen_pipelines[0].keys() == {"pipeline"}
+            configuration.reload()
+            assert len(seen_pipelines) == 1
+
+    def test_reload_sections(self, caplog):
+        """Ignore changes to sections other than pipelines"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    - !MockPool
+                __config_test:
+                    value: 1
+                """,
+            )
+            configuration = ReloadableConfiguration(config.name)
+            configuration.reload()
+            assert get_config_section(configuration.content, "__config_test") == {
+                "value": 1
+            }
+            write_config(
+                config.name,
+                """
+                pipeline:
+                    - !MockPool
+                __config_test:
+                    value: 2
+                """,
+            )
+            with caplog.at_level(logging.WARNING, logger="cobald.runtime.config"):
+                configuration.reload()
+            assert "require a restart" in caplog.text
+            assert get_config_section(configuration.content, "__config_test") == {
+                "value": 1
+            }
+
+
+class TestMultiDocumentConfig:
+    def test_documents(self):
+        """Load the named pipelines of several YAML documents"""
+        with NamedTemporaryFile(suffix=".yaml") as config:
+            # document markers must not be indented
+            write_config(
+                config.name,
+                "pipeline:\n  first:\n    - !MockPool\n"
+                "---\n"
+                "pipeline:\n  second:\n    - !MockPool\n",
+            )
+            with load(config.name) as content:
+                pipelines = get_config_section(content, "pipeline")
+                assert list(pipelines) == ["first", "second"]
+
+    def test_include(self):
+        """Reload the pipelines of included YAML files"""
+        with TemporaryDirectory() as base_path:
+            config_path = os.path.join(base_path, "cobald.yaml")
+            write_config(
+                config_path,
+                """
+                include: sites/*.yaml
+                pipeline:
+                    main:
+                        - !MockPool
+                """,
+            )
+            os.mkdir(os.path.join(base_path, "sites"))
+            for site in ("kit", "desy"):
+                write_config(
+                    os.path.join(base_path, "sites", site + ".yaml"),
+                    """
+                    pipeline:
+                        %s:
+                            - !LinearController
+                              low_utilisation: 0.9
+                              high_allocation: 1.1
+                            - !MockPool
+                    """
+                    % site,
+                )
+            configuration = ReloadableConfiguration(config_path)
+            configuration.reload()
+            before = dict(configuration.pipelines)
+            assert list(before) == ["main", "desy", "kit"]
+            write_config(
+                os.path.join(base_path, "sites", "kit.yaml"),
+                """
+                pipeline:
+                    kit:
+                        - !LinearController
+                          low_utilisation: 0.5
+                          high_allocation: 1.1
+                        - !MockPool
+                """,
+            )
+            configuration.reload()
+            after = configuration.pipelines
+            assert after["desy"] is before["desy"]
+            assert after["kit"].content[0].low_utilisation == 0.5
+
+    @pytest.mark.parametrize(
+        "main, other",
+        [
+            ("include: other.yaml\npipeline: {a: []}", "include: cobald.yaml"),
+            ("include: other.yaml\npipeline: {a: []}", "pipeline: {a: []}"),
+            ("include: other.yaml\npipeline: {a: []}", "pipeline: []"),
+            ("include: other.yaml\npipeline: {a: []}", "logging: {}\n---\nlogging: {}"),
+            ("include: missing.yaml\npipeline: {a: []}", ""),
+        ],
+    )
+    def test_invalid(self, main, other):
+        """Reject ambiguous or recursive YAML documents"""
+        with TemporaryDirectory() as base_path:
+            write_config(os.path.join(base_path, "cobald.yaml"), main)
+            write_config(os.path.join(base_path, "other.yaml"), other)
+            with pytest.raises(ConfigurationError):
+                with load(os.path.join(base_path, "cobald.yaml")):
+                    pass
+
+
+class TestConfigCache:
+    config = """
+    pipeline:
+        - !LinearController
+          low_utilisation: {low}
+          high_allocation: 1.1
+        - !MockPool
+    """
+
+    def test_cache(self):
+        """Reuse the cache of an unchanged YAML config"""
+        with TemporaryDirectory() as cache:
+            with NamedTemporaryFile(suffix=".yaml") as config:
+                write_config(config.name, self.config.format(low=0.9))
+                with load(config.name, cache_dir=cache) as content:
+                    pipeline = get_config_section(content, "pipeline")
+                    assert pipeline[0].low_utilisation == 0.9
+                (cache_file,) = os.listdir(cache)
+                # a broken cache must be ignored and replaced
+                write_config(os.path.join(cache, cache_file), "not a pickle")
+                with load(config.name, cache_dir=cache) as content:
+                    pipeline = get_config_section(content, "pipeline")
+                    assert pipeline[0].low_utilisation == 0.9
+                assert os.listdir(cache) == [cache_file]
+                # a valid cache must be used instead of the configuration
+                os.utime(os.path.join(cache, cache_file), (0, 0))
+                with load(config.name, cache_dir=cache) as content:
+                    pipeline = get_config_section(content, "pipeline")
+                    assert pipeline[0].low_utilisation == 0.9
+                assert os.stat(os.path.join(cache, cache_file)).st_mtime == 0
+
+    def test_cache_invalidate(self):
+        """Replace the cache of a changed YAML config"""
+        with TemporaryDirectory() as cache:
+            with NamedTemporaryFile(suffix=".yaml") as config:
+                write_config(config.name, self.config.format(low=0.9))
+                with load(config.name, cache_dir=cache):
+                    pass
+                before = os.listdir(cache)
+                write_config(config.name, self.config.format(low=0.5))
+                with load(config.name, cache_dir=cache) as content:
+                    pipeline = get_config_section(content, "pipeline")
+                    assert pipeline[0].low_utilisation == 0.5
+                after = os.listdir(cache)
+                assert len(after) == 1 and after != before
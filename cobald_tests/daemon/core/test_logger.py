@@ -0,0 +1,86 @@
+import io
+import queue
+import logging
+import logging.handlers
+import threading
+
+import pytest
+
+from cobald.daemon.core.logger import (
+    BoundedQueueHandler,
+    create_queue_handler,
+    _stop_listener,
+)
+
+
+def make_record(message, *args, level=logging.INFO):
+    return logging.LogRecord(
+        name="test",
+        level=level,
+        pathname=__file__,
+        lineno=0,
+        msg=message,
+        args=args,
+        exc_info=None,
+    )
+
+
+class TestQueueLogging:
+    def test_policy(self):
+        with pytest.raises(ValueError):
+            BoundedQueueHandler(queue.Queue(), overflow="explode")
+
+    def test_drop(self):
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, overflow="drop")
+        for index in range(5):
+            handler.handle(make_record("message %d", index))
+        assert log_queue.qsize() == 2
+        assert handler.dropped == 3
+        # dropped records are reported once the queue has capacity again
+        for _ in range(2):
+            log_queue.get()
+        handler.handle(make_record("message %d", 5))
+        assert log_queue.get().getMessage() == (
+            "dropped 3 log records due to a full log queue"
+        )
+        assert log_queue.get().getMessage() == "message 5"
+
+    def test_block(self):
+        log_queue = queue.Queue(maxsize=1)
+        handler = BoundedQueueHandler(log_queue, overflow="block")
+        handler.handle(make_record("first"))
+        blocked = threading.Thread(
+            target=handler.handle, args=(make_record("second"),), daemon=True
+        )
+        blocked.start()
+        blocked.join(timeout=0.1)
+        assert blocked.is_alive()
+        assert log_queue.get().getMessage() == "first"
+        blocked.join(timeout=1)
+        assert not blocked.is_alive()
+        assert log_queue.get().getMessage() == "second"
+        assert handler.dropped == 0
+
+    def test_forward(self):
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+        handler = create_queue_handler(target, queue_size=16)
+        handler.handle(make_record("value %s", 1337, level=logging.WARNING))
+        # wait until the listener thread has processed all records
+        handler.queue.join()
+        assert stream.getvalue() == "[WARNING] value 1337\n"
+
+    def test_report_on_stop(self):
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        handler = BoundedQueueHandler(queue.Queue(maxsize=1), overflow="drop")
+        listener = logging.handlers.QueueListener(handler.queue, target)
+        for index in range(3):
+            handler.handle(make_record("message %d", index))
+        listener.start()
+        _stop_listener(listener, handler, target)
+        assert stream.getvalue() == (
+            "message 0\ndropped 2 log records due to a full log queue\n"
+        )
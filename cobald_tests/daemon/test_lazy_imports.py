@@ -0,0 +1,51 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def imported_modules(statement: str) -> set:
+    """Get the names of all modules imported by ``statement`` in a new interpreter"""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}\nimport sys\nprint(' '.join(sys.modules))",
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout
+    return set(output.split())
+
+
+#: modules only needed when running or configuring the daemon
+DEFERRED = {
+    "cobald.daemon.runners.meta_runner",
+    "cobald.daemon.runners.trio_runner",
+    "cobald.daemon.runners.asyncio_runner",
+    "cobald.daemon.runners.thread_runner",
+    "yaml",
+    "entrypoints",
+    "toposort",
+}
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "cobald.controller.linear",
+        "cobald.decorator.buffer",
+        "cobald.composite.factory",
+        "cobald.daemon",
+    ],
+)
+def test_import_budget(module):
+    """Importing components does not import the daemon runtime"""
+    assert not imported_modules(f"import {module}") & DEFERRED
+
+
+def test_lazy_runtime():
+    """The runtime is created when first used"""
+    modules = imported_modules("from cobald.daemon import runtime")
+    assert "cobald.daemon.runners.meta_runner" in modules
@@ -8,10 +8,11 @@ import logging
 import signal
 import os
 import gc
+import weakref
 
 import pytest
 
-from cobald.daemon.runners.service import ServiceRunner, service
+from cobald.daemon.runners.service import ServiceRunner, ServiceUnit, service
 
 
 logging.getLogger().level = 10
@@ -59,6 +60,160 @@ async def async_raise_signal(what, sleep):
     sync_raise_signal(what, None)
 
 
+class RecordingRunner(object):
+    def __init__(self):
+        self.payloads = []
+
+    def register_payload(self, *payloads, flavour):
+        self.payloads.extend(payloads)
+
+
+class TestServiceUnit(object):
+    def test_registry(self):
+        """Test that units are adopted once and tracked while running"""
+
+        @service(flavour=threading)
+        class Service(object):
+            def run(self):
+                pass
+
+        a, b = Service(), Service()
+        units = {a.__service_unit__, b.__service_unit__}
+        assert units <= ServiceUnit.units()
+        runner = RecordingRunner()
+        for unit in ServiceUnit.pending():
+            if unit in units:
+                unit.start(runner)
+        assert runner.payloads == [a.run, b.run]
+        assert all(unit.running for unit in units)
+        assert units <= ServiceUnit.units()
+        assert not units & set(ServiceUnit.pending())
+
+    def test_registry_defunct(self):
+        """Test that units of collected services are skipped"""
+
+        @service(flavour=threading)
+        class Service(object):
+            def run(self):
+                pass
+
+        unit = Service().__service_unit__
+        gc.collect()
+        assert unit.service() is None
+        assert unit not in set(ServiceUnit.pending())
+
+    def test_registry_bounded(self):
+        """Test that units of collected services do not pile up"""
+
+        @service(flavour=threading)
+        class Service(object):
+            def run(self):
+                pass
+
+        for _ in range(ServiceUnit.__pending_limit__ * 4):
+            Service()
+        gc.collect()
+        Service()
+        assert len(ServiceUnit.__pending_units__) <= ServiceUnit.__pending_limit__
+
+    def test_collect(self):
+        """Test collecting units defined in a context"""
+
+        @service(flavour=threading)
+        class Service(object):
+            def run(self):
+                pass
+
+        outside = Service()
+        with ServiceUnit.collect() as outer:
+            first = Service()
+            with ServiceUnit.collect() as inner:
+                second = Service()
+        assert outer == [first.__service_unit__, second.__service_unit__]
+        assert inner == [second.__service_unit__]
+        assert outside.__service_unit__ not in outer
+
+    def test_hold(self):
+        """Test that units defined in a hold are not started before it ends"""
+
+        @service(flavour=threading)
+        class Service(object):
+            def run(self):
+                pass
+
+        def define(units):
+            with ServiceUnit.hold(units):
+                helpers.append(Service())
+
+        helpers = []
+        with ServiceUnit.hold() as outer:
+            first = Service()
+            with ServiceUnit.hold():
+                second = Service()
+            helper = threading.Thread(target=define, args=(outer,))
+            helper.start()
+            helper.join()
+            assert ServiceUnit.held() is outer
+            assert not {
+                first.__service_unit__,
+                second.__service_unit__,
+                helpers[0].__service_unit__,
+            } & set(ServiceUnit.pending())
+        assert ServiceUnit.held() is None
+        units = [first.__service_unit__, second.__service_unit__]
+        units.append(helpers[0].__service_unit__)
+        assert outer == units
+        assert set(units) <= set(ServiceUnit.pending())
+
+    def test_cancel_pending(self):
+        """Test that cancelled units are never started"""
+
+        @service(flavour=threading)
+        class Service(object):
+            def run(self):
+                pass
+
+        a = Service()
+        a.__service_unit__.cancel()
+        assert a.__service_unit__.cancelled
+        assert a.__service_unit__ not in set(ServiceUnit.pending())
+        runner = RecordingRunner()
+        a.__service_unit__.start(runner)
+        assert not runner.payloads
+
+    @pytest.mark.parametrize("flavour", (trio, asyncio))
+    def test_cancel_running(self, flavour, caplog):
+        """Test cancelling running services"""
+        # captured log records of registering the service would keep it alive
+        caplog.set_level(logging.INFO, logger="cobald.runtime.runner.meta")
+        runner = ServiceRunner(accept_delay=0.1)
+        started, stopped = threading.Event(), threading.Event()
+        sleep = trio.sleep if flavour is trio else asyncio.sleep
+
+        @service(flavour=flavour)
+        class Service(object):
+            async def run(self):
+                started.set()
+                try:
+                    await sleep(10)
+                finally:
+                    stopped.set()
+
+        with accept(runner, name="test_cancel_running"):
+            a = Service()
+            assert started.wait(timeout=1), "service started"
+            unit = a.__service_unit__
+            reference = weakref.ref(a)
+            del a
+            unit.cancel()
+            assert stopped.wait(timeout=1), "service cancelled"
+            # the runner must not fail due to the cancellation
+            time.sleep(0.05)
+            assert runner.running.is_set()
+            gc.collect()
+            assert reference() is None, "service released"
+
+
 class TestServiceRunner(object):
     def test_unique_reaper(self):
         """Assert that no two runners may fetch services"""
@@ -89,6 +244,53 @@ class TestServiceRunner(object):
             assert b.done.wait(timeout=5), "service thread completed"
             assert len(replies) == 2, "post-registered service ran"
 
+    def test_service_wakeup(self):
+        """Test that services are adopted without waiting for a poll delay"""
+        runner = ServiceRunner(accept_delay=60)
+        started = threading.Event()
+
+        @service(flavour=threading)
+        class Service(object):
+            def run(self):
+                started.set()
+
+        with accept(runner, name="test_service_wakeup"):
+            # let the accept loop go idle before defining a service
+            time.sleep(0.1)
+            a = Service()
+            assert started.wait(timeout=1), "service adopted immediately"
+            del a
+
+    def test_service_thread_pool(self):
+        """Test that services exceeding the thread pool do not block other services"""
+        runner = ServiceRunner(accept_delay=0.1)
+        runner.configure_runner(threading, max_workers=1, max_queue=1)
+        ticks = threading.Semaphore(0)
+        release = threading.Event()
+
+        @service(flavour=threading)
+        class Blocking(object):
+            def run(self):
+                release.wait()
+
+        @service(flavour=trio)
+        class Ticker(object):
+            async def run(self):
+                while True:
+                    ticks.release()
+                    await trio.sleep(0.01)
+
+        services = [Blocking() for _ in range(3)]
+        ticker = Ticker()
+        with accept(runner, name="test_service_thread_pool"):
+            for _ in range(3):
+                assert ticks.acquire(timeout=1), "trio services keep running"
+            metrics = runner.runner_metrics(threading)
+            assert metrics["workers"] == 1
+            assert metrics["queue_depth"] == 2
+            release.set()
+        del services, ticker
+
     def test_execute(self):
         """Test running payloads synchronously"""
         default = random.random()
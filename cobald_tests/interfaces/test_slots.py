@@ -0,0 +1,83 @@
+import sys
+import weakref
+
+import pytest
+
+from cobald.decorator.buffer import Buffer
+from cobald.decorator.standardiser import Standardiser
+from cobald.decorator.logger import Logger
+from cobald.controller.linear import LinearController
+from cobald.controller.relative_supply import RelativeSupplyController
+from cobald.composite.uniform import UniformComposite
+from cobald.composite.weighted import WeightedComposite
+from cobald.composite.factory import FactoryPool
+from cobald.composite.flyweight import FlyweightFactoryPool, DroneView
+from cobald.interfaces import Controller, PoolDecorator
+
+from ..mock.pool import FullMockPool
+
+
+class DictBacked(object):
+    """Reference object storing its attributes in an instance ``__dict__``"""
+
+
+def slot_values(instance) -> dict:
+    """The values of all slots of ``instance``"""
+    return {
+        name: getattr(instance, name)
+        for cls in type(instance).__mro__
+        for name in getattr(cls, "__slots__", ())
+        if name != "__weakref__"
+    }
+
+
+ELEMENTS = pytest.mark.parametrize(
+    "factory",
+    [
+        Buffer,
+        Standardiser,
+        Logger,
+        LinearController,
+        RelativeSupplyController,
+        UniformComposite,
+        WeightedComposite,
+        lambda pool: FactoryPool(pool, factory=FullMockPool),
+        lambda pool: FlyweightFactoryPool(start=id, stop=id),
+        lambda pool: DroneView(FlyweightFactoryPool(start=id, stop=id), 0, 0),
+    ],
+)
+
+
+@ELEMENTS
+def test_compact(factory):
+    """Pipeline elements store their state in slots"""
+    instance = factory(FullMockPool())
+    assert not hasattr(instance, "__dict__")
+    assert weakref.ref(instance)() is instance
+    with pytest.raises(AttributeError):
+        instance.undeclared_attribute = True
+
+
+@ELEMENTS
+def test_memory(factory):
+    """Pipeline elements need less memory than storing attributes in a dict"""
+    instance = factory(FullMockPool())
+    reference = DictBacked()
+    reference.__dict__.update(slot_values(instance))
+    assert sys.getsizeof(instance) < sys.getsizeof(reference) + sys.getsizeof(
+        reference.__dict__
+    )
+
+
+def test_combined_interfaces():
+    """Interfaces sharing a ``target`` can be combined in one class"""
+
+    class ControlledDecorator(Controller, PoolDecorator):
+        __slots__ = ()
+
+        demand = supply = utilisation = allocation = 1.0
+
+    pool = FullMockPool()
+    instance = ControlledDecorator(pool)
+    assert instance.target is pool
+    assert not hasattr(instance, "__dict__")
@@ -1,7 +1,11 @@
 import time
 import ast
+import io
+import threading
 
-from cobald.monitor.format_line import LineProtocolFormatter
+import pytest
+
+from cobald.monitor.format_line import LineProtocolFormatter, LineProtocolStreamHandler
 
 from . import make_test_logger
 
@@ -94,3 +98,113 @@ class TestFormatLine(object):
             r'tag\ key\ with\ sp🚀ces=tag\,value\,with"commas"'
             r' field_k\ey="string field value, only %s" need be esc🍭ped"' % slash
         )
+
+    def test_aggregate_invalid(self):
+        with pytest.raises(ValueError):
+            LineProtocolFormatter(aggregate="mean")
+        with pytest.raises(ValueError):
+            LineProtocolFormatter(resolution=10, aggregate="median")
+
+    @pytest.mark.parametrize(
+        "aggregate, expected",
+        (("last", 3), ("min", 1), ("max", 6), ("mean", 10 / 3)),
+    )
+    def test_aggregate(self, aggregate, expected):
+        logger, handler = make_test_logger(__name__)
+        formatter = handler.formatter = LineProtocolFormatter(
+            {"site"}, resolution=10, aggregate=aggregate
+        )
+        for created, value in ((100, 1), (102, 6), (109, 3)):
+            for site in ("a", "b"):
+                logger.critical(
+                    "message",
+                    {"site": site, "value": value, "state": str(value)},
+                    extra={"created": created},
+                )
+        # the bucket is not completed yet
+        assert handler.content.strip() == ""
+        logger.critical("message", {"site": "a", "value": 1}, extra={"created": 110})
+        lines = [
+            parse_line_protocol(line)
+            for line in handler.content.splitlines()
+            if line.strip()
+        ]
+        assert len(lines) == 2
+        for (_, tags, fields, timestamp), site in zip(lines, ("a", "b")):
+            assert tags == {"site": site}
+            assert fields == {"value": expected, "state": "3"}
+            assert timestamp == 100 * 1e9
+        name, tags, fields, timestamp = parse_line_protocol(formatter.flush())
+        assert tags == {"site": "a"}
+        assert fields == {"value": 1}
+        assert timestamp == 110 * 1e9
+        assert formatter.flush() == ""
+
+    def test_aggregate_handler(self):
+        logger, _ = make_test_logger(__name__)
+        stream = io.StringIO()
+        handler = LineProtocolStreamHandler(stream)
+        handler.formatter = LineProtocolFormatter(resolution=10, aggregate="max")
+        logger.handlers = [handler]
+        for created, value in ((100, 1), (102, 6), (110, 3)):
+            logger.critical("message", {"value": value}, extra={"created": created})
+        # withheld records must not produce empty lines
+        assert stream.getvalue().count("\n") == 1
+        handler.close()
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 2
+        assert [parse_line_protocol(line)[2] for line in lines] == [
+            {"value": 6},
+            {"value": 3},
+        ]
+
+    def test_aggregate_late(self):
+        logger, handler = make_test_logger(__name__)
+        formatter = handler.formatter = LineProtocolFormatter(
+            resolution=10, aggregate="max"
+        )
+        for created, value in ((100, 1), (110, 2), (105, 3)):
+            logger.critical("message", {"value": value}, extra={"created": created})
+        # the late record is merged into the pending bucket
+        lines = [
+            parse_line_protocol(line)
+            for line in handler.content.splitlines()
+            if line.strip()
+        ]
+        assert [(fields, stamp) for _, _, fields, stamp in lines] == [
+            ({"value": 1}, 100 * 1e9)
+        ]
+        _, _, fields, timestamp = parse_line_protocol(formatter.flush())
+        assert fields == {"value": 3}
+        assert timestamp == 110 * 1e9
+
+    def test_aggregate_concurrent(self):
+        logger, handler = make_test_logger(__name__)
+        formatter = handler.formatter = LineProtocolFormatter(
+            resolution=1, aggregate="last"
+        )
+        start = threading.Barrier(4)
+
+        def report(offset: int):
+            start.wait()
+            # threads report interleaved and partially outdated timestamps
+            for created in range(100):
+                logger.critical(
+                    "message",
+                    {"value": created},
+                    extra={"created": 1000 + created + offset},
+                )
+
+        threads = [
+            threading.Thread(target=report, args=(offset,)) for offset in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        output = handler.content + formatter.flush()
+        timestamps = [
+            parse_line_protocol(line)[3] for line in output.splitlines() if line.strip()
+        ]
+        assert len(timestamps) == len(set(timestamps))
+        assert timestamps == sorted(timestamps)
@@ -0,0 +1,79 @@
+import io
+import json
+import logging
+
+from cobald.monitor.format_line import LineProtocolFormatter
+from cobald.monitor.telemetry import (
+    Telemetry,
+    Report,
+    Sink,
+    StreamSink,
+    LoggingSink,
+    json_format,
+)
+
+from . import make_test_logger
+from .test_format_line import parse_line_protocol
+
+
+class CollectingSink(Sink):
+    def __init__(self):
+        self.reports = []
+
+    def emit(self, report: Report):
+        self.reports.append(report)
+
+
+class TestTelemetry(object):
+    def test_report(self):
+        sink = CollectingSink()
+        telemetry = Telemetry(sink)
+        telemetry.report("message", {"a": 1}, {"b": "b"}, timestamp=1337)
+        assert sink.reports == [Report("message", {"b": "b"}, {"a": 1}, 1337)]
+        telemetry.report("message", {"a": 2})
+        assert sink.reports[-1].tags == {}
+        assert sink.reports[-1].timestamp > 1337
+
+    def test_sinks(self):
+        first, second = CollectingSink(), CollectingSink()
+        telemetry = Telemetry()
+        telemetry.report("message", {"a": 1})
+        telemetry.add_sink(first)
+        telemetry.add_sink(second)
+        assert telemetry.sinks == (first, second)
+        telemetry.report("message", {"a": 2})
+        telemetry.remove_sink(first)
+        telemetry.report("message", {"a": 3})
+        assert [report.fields["a"] for report in first.reports] == [2]
+        assert [report.fields["a"] for report in second.reports] == [2, 3]
+
+    def test_line_protocol(self):
+        stream = io.StringIO()
+        telemetry = Telemetry(StreamSink(stream))
+        telemetry.report("message", {"a": 1, "b": 2.5}, {"c": "c"}, timestamp=10)
+        name, tags, fields, timestamp = parse_line_protocol(stream.getvalue())
+        assert name == "message"
+        assert tags == {"c": "c"}
+        assert fields == {"a": 1, "b": 2.5}
+        assert timestamp == 10 * 1e9
+
+    def test_json(self):
+        stream = io.StringIO()
+        telemetry = Telemetry(StreamSink(stream, format=json_format))
+        telemetry.report("message", {"a": 1}, {"c": "c"}, timestamp=10)
+        assert json.loads(stream.getvalue()) == {
+            "name": "message",
+            "tags": {"c": "c"},
+            "fields": {"a": 1},
+            "time": 10,
+        }
+
+    def test_logging(self):
+        logger, handler = make_test_logger(__name__)
+        handler.formatter = LineProtocolFormatter({"c"})
+        telemetry = Telemetry(LoggingSink(logger.name, level=logging.CRITICAL))
+        telemetry.report("message", {"a": 1}, {"c": "c"})
+        name, tags, fields, timestamp = parse_line_protocol(handler.content)
+        assert name == "message"
+        assert tags == {"c": "c"}
+        assert fields == {"a": 1}
@@ -25,9 +25,10 @@ def unwrap_cause(exc: BaseException) -> BaseException:
 
 
 @contextlib.contextmanager
-def threaded_run(name: str) -> Iterator[MetaRunner]:
+def threaded_run(name: str, trio_guest: bool = False) -> Iterator[MetaRunner]:
     gc.collect()
     runner = MetaRunner()
+    runner.configure_runner(trio, guest=trio_guest)
     thread = threading.Thread(target=runner.run, name=name, daemon=True)
     thread.start()
     if not runner.running.wait(1):
@@ -154,3 +155,176 @@ class TestMetaRunner(object):
         with pytest.raises(RuntimeError) as exc:
             runner.run()
         assert isinstance(unwrap_cause(exc.value), TerminateRunner)
+
+    @pytest.mark.parametrize("flavour", (threading, asyncio, trio))
+    def test_register_many(self, flavour):
+        """Test registering many payloads at once"""
+        count = 128
+        done = threading.Semaphore(0)
+
+        def sync_payload():
+            done.release()
+
+        async def async_payload():
+            done.release()
+
+        payload = sync_payload if flavour is threading else async_payload
+        with threaded_run("test_register_many") as runner:
+            runner.register_payload(*[payload] * count, flavour=flavour)
+            for _ in range(count):
+                assert done.acquire(timeout=1)
+
+    def test_trio_bounded(self):
+        """Test registering more trio payloads than the buffer can hold"""
+        count = 32
+        done = threading.Semaphore(0)
+
+        async def payload():
+            await trio.sleep(0)
+            done.release()
+
+        runner = MetaRunner()
+        runner.configure_runner(trio, max_buffer_size=1)
+        with pytest.raises(ValueError):
+            runner.configure_runner(contextlib, max_buffer_size=1)
+        thread = threading.Thread(target=runner.run, daemon=True)
+        thread.start()
+        try:
+            assert runner.running.wait(1)
+            with pytest.raises(RuntimeError):
+                runner.configure_runner(trio, max_buffer_size=2)
+            runner.register_payload(*[payload] * count, flavour=trio)
+            for _ in range(count):
+                runner.register_payload(payload, flavour=trio)
+            for _ in range(2 * count):
+                assert done.acquire(timeout=1)
+        finally:
+            runner.stop()
+            thread.join(timeout=1)
+
+    def test_trio_bounded_queue(self):
+        """Test unqueueing trio payloads that block on asyncio into a bounded buffer"""
+        count = 4
+        done = threading.Semaphore(0)
+
+        async def async_payload():
+            done.release()
+
+        async def payload():
+            # block the trio thread until the asyncio loop is free
+            runner.run_payload(async_payload, flavour=asyncio)
+
+        runner = MetaRunner()
+        runner.configure_runner(trio, max_buffer_size=1)
+        runner.register_payload(*[payload] * count, flavour=trio)
+        thread = threading.Thread(target=runner.run, daemon=True)
+        thread.start()
+        try:
+            assert runner.running.wait(1)
+            for _ in range(count):
+                assert done.acquire(timeout=1)
+        finally:
+            runner.stop()
+            thread.join(timeout=1)
+
+    @pytest.mark.parametrize("max_buffer_size", (1.5, -1, "inf"))
+    def test_trio_bounded_invalid(self, max_buffer_size):
+        """Test that invalid trio buffers fail instead of blocking the startup"""
+        runner = MetaRunner()
+        runner.configure_runner(trio, max_buffer_size=max_buffer_size)
+        with pytest.raises(RuntimeError):
+            runner.run()
+        assert not runner.running.is_set()
+
+    def test_trio_start_failure(self, monkeypatch):
+        """Test that trio failing to start does not block the startup"""
+
+        def open_memory_channel(max_buffer_size):
+            raise TypeError("max_buffer_size must be an integer or math.inf")
+
+        monkeypatch.setattr(trio, "open_memory_channel", open_memory_channel)
+        runner = MetaRunner()
+        with pytest.raises(RuntimeError):
+            runner.run()
+
+    @pytest.mark.parametrize("event_loop", ("asyncio", "auto", "uvloop"))
+    def test_event_loop(self, event_loop):
+        """Test hosting runners in different event loops"""
+        if event_loop == "uvloop":
+            pytest.importorskip("uvloop")
+
+        async def loop_module():
+            return type(asyncio.get_running_loop()).__module__
+
+        default_policy = asyncio.get_event_loop_policy()
+        runner = MetaRunner(event_loop=event_loop)
+        thread = threading.Thread(target=runner.run, daemon=True)
+        thread.start()
+        try:
+            assert runner.running.wait(1)
+            with pytest.raises(RuntimeError):
+                runner.configure_event_loop("asyncio")
+            module = runner.run_payload(loop_module, flavour=asyncio)
+        finally:
+            runner.stop()
+            thread.join(timeout=1)
+        if event_loop == "asyncio":
+            assert module.startswith("asyncio")
+        elif event_loop == "uvloop":
+            assert module.startswith("uvloop")
+        assert asyncio.get_event_loop_policy() is default_policy
+
+    def test_event_loop_invalid(self):
+        with pytest.raises(ValueError):
+            MetaRunner(event_loop="tokio")
+        with pytest.raises(ValueError):
+            MetaRunner().configure_event_loop("tokio")
+
+
+class TestTrioGuest(object):
+    def test_run_coroutine(self):
+        """Test executing a coroutine in guest mode"""
+
+        async def trio_thread():
+            await trio.sleep(0)
+            return threading.get_ident()
+
+        async def asyncio_thread():
+            return threading.get_ident()
+
+        with threaded_run("test_run_coroutine", trio_guest=True) as runner:
+            assert runner.run_payload(trio_thread, flavour=trio) == runner.run_payload(
+                asyncio_thread, flavour=asyncio
+            )
+
+    def test_register_from_host(self):
+        """Test registering trio payloads from asyncio in guest mode"""
+        done = threading.Semaphore(0)
+
+        async def trio_payload():
+            await trio.sleep(0)
+            done.release()
+
+        async def asyncio_payload():
+            runner.register_payload(trio_payload, trio_payload, flavour=trio)
+            with pytest.raises(RuntimeError):
+                runner.run_payload(trio_payload, flavour=trio)
+
+        with threaded_run("test_register_from_host", trio_guest=True) as runner:
+            runner.register_payload(asyncio_payload, flavour=asyncio)
+            runner.register_payload(trio_payload, flavour=trio)
+            for _ in range(3):
+                assert done.acquire(timeout=1)
+
+    def test_return_coroutine(self):
+        """Test that returning from guest coroutines aborts runners"""
+
+        async def with_return():
+            return "unhandled return value"
+
+        runner = MetaRunner()
+        runner.configure_runner(trio, guest=True)
+        runner.register_payload(with_return, flavour=trio)
+        with pytest.raises(RuntimeError) as exc:
+            runner.run()
+        assert isinstance(unwrap_cause(exc.value), OrphanedReturn)
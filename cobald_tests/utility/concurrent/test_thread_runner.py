@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import trio
+
+from cobald.daemon.runners.thread_runner import ThreadRunner
+
+
+class TestThreadRunnerPool(object):
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            ThreadRunner(asyncio.new_event_loop(), max_workers=0)
+
+    def test_queue_depth(self):
+        runner = ThreadRunner(asyncio.new_event_loop(), max_workers=2)
+        release = threading.Event()
+        done = threading.Semaphore(0)
+        threads = set()
+
+        def payload():
+            threads.add(threading.get_ident())
+            release.wait()
+            done.release()
+
+        for _ in range(5):
+            runner.register_payload(payload)
+        assert runner.workers == 2
+        # workers may not have picked up their first payload yet
+        assert 3 <= runner.queue_depth <= 5
+        release.set()
+        for _ in range(5):
+            assert done.acquire(timeout=1)
+        assert len(threads) == 2
+        assert runner.queue_depth == 0
+        for _ in range(10):
+            if runner.idle_workers == 2:
+                break
+            time.sleep(0.05)
+        assert runner.idle_workers == 2
+        # idle workers are reused
+        runner.register_payload(payload)
+        assert done.acquire(timeout=1)
+        assert runner.workers == 2
+        assert len(threads) == 2
+
+    def test_bounded_queue(self):
+        runner = ThreadRunner(asyncio.new_event_loop(), max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        def payload():
+            release.wait()
+
+        runner.register_payload(payload)
+        runner.register_payload(payload)
+        blocked = threading.Thread(
+            target=runner.register_payload, args=(payload,), daemon=True
+        )
+        blocked.start()
+        blocked.join(timeout=0.1)
+        # the pool must start the queued payload first
+        assert blocked.is_alive()
+        release.set()
+        blocked.join(timeout=1)
+        assert not blocked.is_alive()
+
+    @pytest.mark.parametrize("flavour", (asyncio, trio))
+    def test_bounded_queue_event_loop(self, flavour):
+        runner = ThreadRunner(asyncio.new_event_loop(), max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        def payload():
+            release.wait()
+
+        async def register():
+            for _ in range(3):
+                runner.register_payload(payload)
+
+        # event loops must not block, exceeding the queue instead
+        if flavour is asyncio:
+            asyncio.run(register())
+        else:
+            trio.run(register)
+        assert runner.queue_depth >= 1
+        assert runner.metrics()["workers"] == 1
+        release.set()
+
+    def test_close(self):
+        loop = asyncio.new_event_loop()
+        runner = ThreadRunner(loop, max_workers=1)
+        release = threading.Event()
+
+        def payload():
+            release.wait()
+
+        for _ in range(3):
+            runner.register_payload(payload)
+        runner._stopped.clear()
+        loop.run_until_complete(runner.aclose())
+        assert runner.queue_depth == 0
+        release.set()
+        for _ in range(10):
+            if runner.workers == 0:
+                break
+            time.sleep(0.05)
+        assert runner.workers == 0
@@ -63,6 +63,7 @@ if __name__ == "__main__":
         ],
         extras_require={
             "docs": ["sphinx", "sphinx_rtd_theme"],
+            "uvloop": ["uvloop"],
             "test": TESTS_REQUIRE,
             "contrib": [
                 "flake8",
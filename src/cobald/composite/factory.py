@@ -1,5 +1,5 @@
-from typing import Callable
-import weakref
+from typing import Callable, Dict
+import time
 
 import trio
 
@@ -14,6 +14,7 @@ class FactoryPool(CompositePool):
 
     :param factory: a callable that produces a new :py:class:`~.Pool`
     :param interval: how often to adjust the number of children
+    :param drain_timeout: how long to track children shutting down, in seconds
 
     Adjustment uses two extensions that children must respond to adequately:
 
@@ -35,12 +36,31 @@ class FactoryPool(CompositePool):
     It is the responsibility of children to report their status accordingly.
     For example, if a child shuts down and does not allocate its ``supply`` further,
     it should scale its reported ``allocation`` accordingly.
+
+    Disabled children are tracked as shutting down until they report
+    ``supply <= 0`` or until ``drain_timeout`` has passed, whichever comes first.
+    Until then, they still contribute to the :py:class:`FactoryPool`.
     """
 
+    __slots__ = (
+        "_demand",
+        "_hatchery",
+        "_mortuary",
+        "factory",
+        "interval",
+        "drain_timeout",
+        "__service_unit__",
+    )
+
     @property
     def children(self):
         return [*self._hatchery, *self._mortuary]
 
+    @property
+    def draining(self) -> int:
+        """The number of children shutting down"""
+        return len(self._mortuary)
+
     @property
     def demand(self):
         return self._demand
@@ -76,19 +96,33 @@ class FactoryPool(CompositePool):
             return 1.0
 
     def __init__(
-        self, *children: Pool, factory: Callable[[], Pool], interval: float = 30
+        self,
+        *children: Pool,
+        factory: Callable[[], Pool],
+        interval: float = 30,
+        drain_timeout: float = float("inf"),
     ):
         self._demand = sum(child.demand for child in children)
         #: children fulfilling our demand
         self._hatchery = set(children)
-        #: children shutting down
-        self._mortuary = weakref.WeakSet()
+        #: children shutting down and their deadline for doing so
+        self._mortuary: Dict[Pool, float] = {}
         self.factory = factory
         self.interval = interval
+        self.drain_timeout = drain_timeout
+
+    def __checkpoint__(self):
+        # children represent external resources and cannot be restored,
+        # the restored demand lets the pool spawn children on its next run
+        return {"demand": self._demand}
+
+    def __restore__(self, state):
+        self._demand = state["demand"]
 
     async def run(self):
         while True:
             await trio.sleep(self.interval)
+            self._evict_children()
             # freeze target demand in case another thread updates us
             supply, demand = self.supply, self.demand
             if supply > demand:
@@ -131,4 +165,13 @@ class FactoryPool(CompositePool):
     def _release_child(self, child: Pool):
         child.demand = 0
         self._hatchery.discard(child)
-        self._mortuary.add(child)
+        self._mortuary[child] = time.monotonic() + self.drain_timeout
+
+    def _evict_children(self):
+        """Stop tracking children that have shut down or exceeded their deadline"""
+        now = time.monotonic()
+        self._mortuary = {
+            child: deadline
+            for child, deadline in self._mortuary.items()
+            if child.supply > 0 and deadline > now
+        }
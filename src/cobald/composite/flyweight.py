@@ -0,0 +1,283 @@
+from typing import Any, Callable, Iterator, List
+from array import array
+import math
+
+import trio
+
+from cobald.interfaces import Pool, CompositePool
+from cobald.daemon import service
+
+
+#: state of a row that does not represent any child
+FREE = 0
+#: state of a row whose child fulfils demand
+ACTIVE = 1
+#: state of a row whose child is shutting down
+RELEASED = 2
+
+
+class DroneView(Pool):
+    """
+    View of a single child of a :py:class:`~.FlyweightFactoryPool`
+
+    :param store: the pool storing the state of the child
+    :param row: the index of the child in the ``store``
+    :param generation: the generation of the child, defaults to the current one
+
+    Views are created on demand and do not hold any state themselves;
+    creating several views of the same row is allowed.
+    Once the row is recycled for a new child, the view is :py:attr:`stale`:
+    it reads as an empty child and ignores any updates.
+    """
+
+    __slots__ = ("store", "row", "generation")
+
+    def __init__(self, store: "FlyweightFactoryPool", row: int, generation: int = None):
+        self.store = store
+        self.row = row
+        self.generation = store.generations[row] if generation is None else generation
+
+    @property
+    def stale(self) -> bool:
+        """Whether the row of this view has been recycled for another child"""
+        return self.store.generations[self.row] != self.generation
+
+    def _get(self, values: array) -> float:
+        return 0.0 if self.stale else values[self.row]
+
+    def _set(self, values: array, value: float):
+        if not self.stale:
+            values[self.row] = value
+
+    @property
+    def demand(self) -> float:
+        return self._get(self.store.demands)
+
+    @demand.setter
+    def demand(self, value: float):
+        self._set(self.store.demands, value)
+
+    @property
+    def supply(self) -> float:
+        return self._get(self.store.supplies)
+
+    @supply.setter
+    def supply(self, value: float):
+        self._set(self.store.supplies, value)
+
+    @property
+    def utilisation(self) -> float:
+        return self._get(self.store.utilisations)
+
+    @utilisation.setter
+    def utilisation(self, value: float):
+        self._set(self.store.utilisations, value)
+
+    @property
+    def allocation(self) -> float:
+        return self._get(self.store.allocations)
+
+    @allocation.setter
+    def allocation(self, value: float):
+        self._set(self.store.allocations, value)
+
+    def __repr__(self):
+        return "<%s row=%d of %r>" % (self.__class__.__name__, self.row, self.store)
+
+
+@service(flavour=trio)
+class FlyweightFactoryPool(CompositePool):
+    """
+    Composition of many homogeneous children stored as rows of arrays
+
+    :param start: callback to start the resources of a new child
+    :param stop: callback to shut down the resources of a child
+    :param drone_demand: the initial demand of each new child
+    :param interval: how often to adjust the number of children
+
+    This pool adds and removes children to satisfy demand, just like the
+    :py:class:`~cobald.composite.factory.FactoryPool`. Instead of one
+    :py:class:`~.Pool` object per child, the ``demand``, ``supply``,
+    ``utilisation``, ``allocation`` and ``state`` of all children are
+    stored in compact arrays, indexed by the *row* of each child.
+    A thin :py:class:`~.DroneView` is only created when accessing
+    :py:attr:`children`.
+
+    The actual resources of each child are managed by the ``start`` and
+    ``stop`` callbacks, which receive a :py:class:`~.DroneView` of the child.
+    The ``start`` callback is invoked whenever a row is assigned to a new child,
+    and the ``stop`` callback once the child is released.
+    The resources must update the ``supply``, ``utilisation`` and ``allocation``
+    of their view; a released row is recycled for new children once its
+    ``supply`` is ``0``. Each recycling increments the ``generation`` of the
+    row, so that views of the previous child cannot modify the new child.
+
+    .. code:: python
+
+        pool = FlyweightFactoryPool(
+            start=lambda drone: backend.submit(drone.row),
+            stop=lambda drone: backend.cancel(drone.row),
+        )
+    """
+
+    __slots__ = (
+        "_demand",
+        "_free_rows",
+        "start",
+        "stop",
+        "drone_demand",
+        "interval",
+        "demands",
+        "supplies",
+        "utilisations",
+        "allocations",
+        "states",
+        "generations",
+        "__service_unit__",
+    )
+
+    @property
+    def children(self) -> List[DroneView]:
+        return [DroneView(self, row) for row in self.rows(ACTIVE, RELEASED)]
+
+    @property
+    def demand(self):
+        return self._demand
+
+    @demand.setter
+    def demand(self, value):
+        # just acknowledge demand and defer any actions
+        self._demand = value
+
+    @property
+    def supply(self):
+        # unused rows are zeroed, so their supply does not count
+        return math.fsum(self.supplies)
+
+    @property
+    def utilisation(self):
+        return self._active_mean(self.utilisations)
+
+    @property
+    def allocation(self):
+        return self._active_mean(self.allocations)
+
+    def _active_mean(self, values: array) -> float:
+        """Mean of ``values`` over all rows with a positive supply"""
+        total, count = 0.0, 0
+        for supply, value in zip(self.supplies, values):
+            if supply > 0:
+                total += value
+                count += 1
+        return total / count if count else 1.0
+
+    def __init__(
+        self,
+        *,
+        start: Callable[[DroneView], Any],
+        stop: Callable[[DroneView], Any],
+        drone_demand: float = 1,
+        interval: float = 30,
+    ):
+        if drone_demand <= 0:
+            raise ValueError("drone_demand must be positive")
+        self._demand = 0.0
+        self._free_rows: List[int] = []
+        self.start = start
+        self.stop = stop
+        self.drone_demand = drone_demand
+        self.interval = interval
+        self.demands = array("d")
+        self.supplies = array("d")
+        self.utilisations = array("d")
+        self.allocations = array("d")
+        self.states = array("b")
+        self.generations = array("I")
+
+    def rows(self, *states: int) -> Iterator[int]:
+        """Iterate over the rows of all children in any of ``states``"""
+        return (row for row, state in enumerate(self.states) if state in states)
+
+    def __checkpoint__(self):
+        # children represent external resources and cannot be restored,
+        # the restored demand lets the pool spawn children on its next run
+        return {"demand": self._demand}
+
+    def __restore__(self, state):
+        self._demand = state["demand"]
+
+    async def run(self):
+        while True:
+            await trio.sleep(self.interval)
+            self.adjust()
+
+    def adjust(self):
+        """Add or remove children to match the current demand"""
+        self._recycle_rows()
+        # freeze target demand in case another thread updates us
+        supply, demand = self.supply, self.demand
+        if supply > demand:
+            self._shrink(target=demand)
+        else:
+            self._grow(target=demand)
+
+    def _shrink(self, target: float):
+        # prefer reaping children that supply few used resources
+        supplies, utilisations, demands = (
+            self.supplies,
+            self.utilisations,
+            self.demands,
+        )
+        hit_list = sorted(
+            self.rows(ACTIVE), key=lambda row: supplies[row] * utilisations[row]
+        )
+        excess_demand = math.fsum(demands[row] for row in hit_list) - target
+        for row in hit_list:
+            if excess_demand <= 0:
+                break
+            if demands[row] <= excess_demand:
+                excess_demand -= demands[row]
+                self._release_row(row)
+        self._reap_rows()
+
+    def _grow(self, target: float):
+        missing_demand = target - math.fsum(self.demands)
+        while missing_demand > 0:
+            self._spawn_row()
+            missing_demand -= self.drone_demand
+        self._reap_rows()
+
+    def _spawn_row(self) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self.demands[row] = self.drone_demand
+            self.states[row] = ACTIVE
+        else:
+            self.demands.append(self.drone_demand)
+            self.supplies.append(0.0)
+            self.utilisations.append(0.0)
+            self.allocations.append(0.0)
+            self.states.append(ACTIVE)
+            self.generations.append(0)
+            row = len(self.states) - 1
+        self.start(DroneView(self, row))
+        return row
+
+    def _reap_rows(self):
+        demands = self.demands
+        for row in [row for row in self.rows(ACTIVE) if demands[row] <= 0]:
+            self._release_row(row)
+
+    def _release_row(self, row: int):
+        self.demands[row] = 0.0
+        self.states[row] = RELEASED
+        self.stop(DroneView(self, row))
+
+    def _recycle_rows(self):
+        """Free the rows of released children which no longer provide supply"""
+        supplies = self.supplies
+        for row in [row for row in self.rows(RELEASED) if supplies[row] <= 0]:
+            self.supplies[row] = self.utilisations[row] = self.allocations[row] = 0.0
+            self.states[row] = FREE
+            self.generations[row] += 1
+            self._free_rows.append(row)
@@ -1,4 +1,5 @@
 from ..interfaces import Pool, CompositePool
+from ..utility.checkpoint import get_children_state, set_children_state
 
 
 class UniformComposite(CompositePool):
@@ -6,7 +7,7 @@ class UniformComposite(CompositePool):
     Uniform composition of several pools, with each pool weighted the same
     """
 
-    children = []
+    __slots__ = ("_demand", "children")
 
     @property
     def demand(self):
@@ -42,3 +43,10 @@ class UniformComposite(CompositePool):
     def __init__(self, *children: Pool):
         self._demand = sum(child.demand for child in children)
         self.children = list(children)
+
+    def __checkpoint__(self):
+        return {"demand": self._demand, "children": get_children_state(self.children)}
+
+    def __restore__(self, state):
+        self._demand = state["demand"]
+        set_children_state(self.children, state["children"])
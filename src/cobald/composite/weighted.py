@@ -1,6 +1,7 @@
 from typing import Literal
 
 from ..interfaces import Pool, CompositePool
+from ..utility.checkpoint import get_children_state, set_children_state
 
 
 class WeightedComposite(CompositePool):
@@ -26,7 +27,7 @@ class WeightedComposite(CompositePool):
     fitness of all its children is 0, or there are no children.
     """
 
-    children = []
+    __slots__ = ("_weight", "_demand", "children")
 
     @property
     def demand(self):
@@ -104,3 +105,10 @@ class WeightedComposite(CompositePool):
         self._weight = weight
         self._demand = sum(child.demand for child in children)
         self.children = list(children)
+
+    def __checkpoint__(self):
+        return {"demand": self._demand, "children": get_children_state(self.children)}
+
+    def __restore__(self, state):
+        self._demand = state["demand"]
+        set_children_state(self.children, state["children"])
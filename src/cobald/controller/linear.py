@@ -17,6 +17,14 @@ class LinearController(Controller):
     :param interval: interval between adjustments in seconds
     """
 
+    __slots__ = (
+        "rate",
+        "interval",
+        "low_utilisation",
+        "high_allocation",
+        "__service_unit__",
+    )
+
     def __init__(
         self, target: Pool, low_utilisation=0.5, high_allocation=0.5, rate=1, interval=1
     ):
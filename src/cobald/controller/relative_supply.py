@@ -18,6 +18,15 @@ class RelativeSupplyController(Controller):
     :param interval: interval between adjustments in seconds
     """
 
+    __slots__ = (
+        "interval",
+        "low_utilisation",
+        "high_allocation",
+        "low_scale",
+        "high_scale",
+        "__service_unit__",
+    )
+
     def __init__(
         self,
         target: Pool,
@@ -1,6 +1,23 @@
+import threading
+
 from .runners.service import ServiceRunner, service
 
-#: The runner invoked on daemon startup
-runtime = ServiceRunner()
+_runtime_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    # The runtime is created lazily since it requires the entire runner stack.
+    # This allows to cheaply import services without running them.
+    if name == "runtime":
+        global runtime
+        with _runtime_lock:
+            try:
+                return globals()["runtime"]
+            except KeyError:
+                #: The runner invoked on daemon startup
+                runtime = ServiceRunner()
+                return runtime
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["runtime", "service"]
@@ -1,18 +1,35 @@
 import logging
 import logging.config
 import sys
-from typing import Any, Dict, TypeVar, Callable, Tuple, Generic
-
-from entrypoints import EntryPoint
+from contextlib import nullcontext
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Dict,
+    TypeVar,
+    Callable,
+    Tuple,
+    Generic,
+    List,
+    Union,
+)
 
 from ..plugins import PluginRequirements
 
+if TYPE_CHECKING:
+    from entrypoints import EntryPoint
+
 _logger = logging.getLogger(__package__)
 
 
 T = TypeVar("T")
 #: type of a mapping element, matching JSON/YAML
 M = TypeVar("M", str, int, float, bool, dict, list)
+#: marker for the absence of a key in a nested structure
+_NO_KEY = object()
+#: objects loaded by :py:meth:`Translator.load_name`, by absolute name
+_loaded_names: Dict[str, Any] = {}
 
 
 class ConfigurationError(Exception):
@@ -41,36 +58,78 @@ class Translator(object):
     def translate_hierarchy(
         self, structure: M, *, where: str = "", **construct_kwargs
     ) -> M:
+        if not isinstance(structure, (dict, list)):
+            return structure
+        # Translate nested containers depth-first with an explicit stack of
+        # [container, pending keys, translated items, key in parent] frames.
+        # Lists are translated bottom up, dicts in order; the location of an
+        # element is only formatted when reporting an error.
+        stack = [self._frame(structure, None)]
+        delegate = self._delegate
         try:
-            if isinstance(structure, dict):
-                structure = {
-                    key: self.translate_hierarchy(value, where="%s.%s" % (where, key))
-                    for key, value in structure.items()
-                }
-                if "__type__" in structure:
-                    return self.construct(structure, **construct_kwargs)
-                return structure
-            elif isinstance(structure, list):
-                # translate bottom up - need those lists to materialize
-                # reversed and enumerate iterables
-                return list(
-                    reversed(
-                        [
-                            self.translate_hierarchy(
-                                item, where="%s[%s]" % (where, index)
-                            )
-                            for index, item in reversed(list(enumerate(structure)))
-                        ]
-                    )
-                )
-            else:
-                return structure
+            while True:
+                container, pending, items, key = stack[-1]
+                if pending:
+                    child_key = pending.pop()
+                    child = container[child_key]
+                    if delegate(child):
+                        items[child_key] = self.translate_hierarchy(
+                            child, where=self._where(where, stack, child_key)
+                        )
+                    elif not isinstance(child, (dict, list)):
+                        items[child_key] = child
+                    else:
+                        stack.append(self._frame(child, child_key))
+                    continue
+                if isinstance(items, dict) and "__type__" in items:
+                    if len(stack) == 1:
+                        items = self.construct(items, **construct_kwargs)
+                    else:
+                        items = self.construct(items)
+                stack.pop()
+                if not stack:
+                    return items
+                stack[-1][2][key] = items
         except ConfigurationError as err:
             if err.where is None:
-                raise ConfigurationError(what=err.what, where=where) from err
+                raise ConfigurationError(
+                    what=err.what, where=self._where(where, stack)
+                ) from err
             raise
         except Exception as err:
-            raise ConfigurationError(where=where, what=err) from err
+            raise ConfigurationError(where=self._where(where, stack), what=err) from err
+
+    @staticmethod
+    def _frame(container: Union[dict, list], key) -> list:
+        if isinstance(container, dict):
+            return [container, list(reversed(container.keys())), {}, key]
+        return [container, list(range(len(container))), [None] * len(container), key]
+
+    @staticmethod
+    def _where(where: str, stack: List[list], child_key=_NO_KEY) -> str:
+        """Format the location of the innermost element of ``stack``"""
+        path = [where]
+        keys = [frame[3] for frame in stack[1:]]
+        if child_key is not _NO_KEY:
+            keys.append(child_key)
+        for frame, key in zip(stack, keys):
+            if isinstance(frame[0], dict):
+                path.append(".%s" % (key,))
+            else:
+                path.append("[%s]" % (key,))
+        return "".join(path)
+
+    def _delegate(self, structure: Any) -> bool:
+        """
+        Whether a nested ``structure`` requires :py:meth:`translate_hierarchy`
+
+        By default, all nested elements are passed to
+        :py:meth:`translate_hierarchy` if a subclass overrides it,
+        and are translated iteratively otherwise.
+        Subclasses that specialise :py:meth:`translate_hierarchy` only for some
+        structures should return :py:data:`True` just for them.
+        """
+        return type(self).translate_hierarchy is not Translator.translate_hierarchy
 
     def construct(self, mapping: dict, **kwargs):
         """
@@ -81,33 +140,47 @@ class Translator(object):
         """
         assert "__type__" not in kwargs and "__args__" not in kwargs
         mapping = {**mapping, **kwargs}
-        factory_fqdn = mapping.pop("__type__")
-        factory = self.load_name(factory_fqdn)
+        factory = self.load_name(mapping.pop("__type__"))
         args = mapping.pop("__args__", [])
         return factory(*args, **mapping)
 
     @staticmethod
     def load_name(absolute_name: str):
-        """Load an object based on an absolute, dotted name"""
-        path = absolute_name.split(".")
+        """
+        Load an object based on an absolute, dotted name
+
+        Loaded objects are cached for all translators and threads,
+        so that loading many pipelines resolves each name only once.
+        """
         try:
-            __import__(absolute_name)
-        except ImportError:
-            try:
-                obj = sys.modules[path[0]]
-            except KeyError:
-                raise ImportError("No module named %r" % path[0]) from None
-            else:
-                for component in path[1:]:
-                    try:
-                        obj = getattr(obj, component)
-                    except AttributeError as err:
-                        raise ConfigurationError(
-                            what="no such object %r" % absolute_name
-                        ) from err
-                return obj
-        else:  # ImportError is not raised if ``absolute_name`` points to a valid module
-            return sys.modules[absolute_name]
+            return _loaded_names[absolute_name]
+        except KeyError:
+            # threads racing to resolve a name all get the same object
+            obj = _loaded_names[absolute_name] = _resolve_name(absolute_name)
+            return obj
+
+
+def _resolve_name(absolute_name: str):
+    """Resolve an object based on an absolute, dotted name"""
+    path = absolute_name.split(".")
+    try:
+        __import__(absolute_name)
+    except ImportError:
+        try:
+            obj = sys.modules[path[0]]
+        except KeyError:
+            raise ImportError("No module named %r" % path[0]) from None
+        else:
+            for component in path[1:]:
+                try:
+                    obj = getattr(obj, component)
+                except AttributeError as err:
+                    raise ConfigurationError(
+                        what="no such object %r" % absolute_name
+                    ) from err
+            return obj
+    else:  # ImportError is not raised if ``absolute_name`` points to a valid module
+        return sys.modules[absolute_name]
 
 
 class SectionPlugin(Generic[M]):
@@ -141,7 +214,7 @@ class SectionPlugin(Generic[M]):
         self.requirements = requirements
 
     @classmethod
-    def load(cls, entry_point: EntryPoint) -> "SectionPlugin":
+    def load(cls, entry_point: "EntryPoint") -> "SectionPlugin":
         """
         Load a plugin from a pre-parsed entry point
 
@@ -175,21 +248,28 @@ class SectionPlugin(Generic[M]):
 
 
 def load_configuration(
-    config_data: Dict[str, Any], plugins: Tuple[SectionPlugin] = ()
+    config_data: Dict[str, Any],
+    plugins: Tuple[SectionPlugin] = (),
+    timer: Callable[[str], ContextManager] = nullcontext,
 ) -> Dict[SectionPlugin, Any]:
     """
     Load the configuration from a mapping, applying plugins to sections
 
     :param config_data: the raw configuration without any plugins applied
     :param plugins: all plugins that *might* apply, in order
+    :param timer: context manager factory wrapping each section
     :return: the output of all applied plugins
+
+    The ``timer`` is called with the name of each phase, such as
+    ``"section logging"``, and may for example measure its duration.
     """
     try:
         logging_mapping = config_data.pop("logging")
     except KeyError:
         pass
     else:
-        configure_logging(logging_mapping)
+        with timer("section logging"):
+            configure_logging(logging_mapping)
     # see if there is any unexpected config content
     unmatched = config_data.keys() - {plugin.section for plugin in plugins}
     if unmatched:
@@ -208,7 +288,8 @@ def load_configuration(
         else:
             # invoke the plugin and store possible output
             # to avoid it being garbage collected
-            plugin_content = plugin.digest(section_data)
+            with timer("section %s" % plugin.section):
+                plugin_content = plugin.digest(section_data)
             if plugin_content is not None:
                 content[plugin] = plugin_content
     return content
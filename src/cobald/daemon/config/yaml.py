@@ -1,6 +1,11 @@
 from typing import Type, Tuple, Callable, TypeVar
 
-from yaml import SafeLoader, BaseLoader, nodes
+from yaml import BaseLoader, nodes
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # libyaml is not available
+    from yaml import SafeLoader  # type: ignore
 
 from .mapping import (
     load_configuration as load_mapping_configuration,
@@ -15,10 +20,36 @@ R = TypeVar("R")
 def load_configuration(
     path: str, loader: Type[BaseLoader] = SafeLoader, plugins: Tuple[SectionPlugin] = ()
 ):
+    """
+    Load the configuration from a YAML file, applying plugins to sections
+
+    All documents of the file are merged the same way as by
+    :py:func:`cobald.daemon.core.config.load`: named pipelines of all
+    documents are combined, and every other section may only be defined once.
+    Includes and pipeline templates are only supported by
+    :py:func:`~cobald.daemon.core.config.load`.
+    """
+    # the daemon core builds on this module
+    from ..core.config import _merge_documents
+
     with open(path) as yaml_stream:
         loader_instance = loader(yaml_stream)
         try:
-            config_data = loader_instance.get_single_data()
+            documents = []
+            while loader_instance.check_node():
+                documents.append((path, loader_instance.get_node()))
+            if len(documents) > 1:
+                for where, document in documents:
+                    if not isinstance(document, nodes.MappingNode):
+                        raise ConfigurationError(
+                            where=where, what="configuration must be a mapping"
+                        )
+                root = _merge_documents(documents)
+            else:
+                root = documents[0][1] if documents else None
+            config_data = (
+                loader_instance.construct_document(root) if root is not None else None
+            )
         finally:
             loader_instance.dispose()
     return load_mapping_configuration(config_data=config_data, plugins=plugins)
@@ -0,0 +1,130 @@
+"""
+Cache of parsed YAML configurations
+
+Parsing large YAML configurations is expensive. The cache stores the
+composed node tree of a configuration, before any objects are constructed,
+in a binary format that is fast to load.
+
+Cached node trees are identified by the content of the configuration as well
+as the versions of Python, :py:mod:`yaml`, :py:mod:`cobald` and all plugins.
+Changing any of them automatically invalidates the cache.
+
+.. warning::
+
+    The cache uses :py:mod:`pickle`, which can execute arbitrary code when
+    loading. The cache directory must only be writable by trusted users.
+"""
+
+from typing import Callable, Optional, Iterable
+import hashlib
+import logging
+import os
+import pickle
+import platform
+
+import yaml
+from yaml import nodes
+
+import cobald.__about__
+
+
+#: version of the cache format
+CACHE_VERSION = 2
+
+
+_logger = logging.getLogger("cobald.runtime.config")
+
+
+def _environment_key(plugin_entries: Iterable) -> bytes:
+    """Identifier of everything besides the content that influences parsing"""
+    components = [
+        "cache=%d" % CACHE_VERSION,
+        "python=%s" % platform.python_version(),
+        "yaml=%s libyaml=%s" % (yaml.__version__, yaml.__with_libyaml__),
+        "cobald=%s" % cobald.__about__.__version__,
+    ]
+    for entry in plugin_entries:
+        distro = entry.distro
+        components.append(
+            "%s=%s:%s (%s %s)"
+            % (
+                entry.name,
+                entry.module_name,
+                entry.object_name,
+                distro.name if distro is not None else None,
+                distro.version if distro is not None else None,
+            )
+        )
+    return "\n".join(components).encode()
+
+
+def cache_path(
+    cache_dir: str, config_path: str, content: bytes, plugin_entries: Iterable = ()
+) -> str:
+    """Path of the cache file for a configuration ``content``"""
+    config_key = hashlib.sha256(os.path.abspath(config_path).encode()).hexdigest()
+    content_key = hashlib.sha256(content)
+    content_key.update(_environment_key(plugin_entries))
+    return os.path.join(
+        cache_dir, "%s-%s.pickle" % (config_key[:16], content_key.hexdigest())
+    )
+
+
+def cached_compose(
+    cache_dir: Optional[str],
+    config_path: str,
+    content: bytes,
+    compose: Callable[[bytes], nodes.Node],
+    plugin_entries: Iterable = (),
+) -> nodes.Node:
+    """
+    Compose the node tree of a configuration, using the cache if possible
+
+    :param cache_dir: directory of the cache, or :py:data:`None` to disable it
+    :param config_path: path of the configuration
+    :param content: content of the configuration
+    :param compose: callable composing the node tree of ``content``
+    :param plugin_entries: entry points of all plugins used for loading
+
+    A missing or broken cache is not an error; the configuration is composed
+    and the cache is updated. Outdated cache files of the same configuration
+    are removed.
+    """
+    if cache_dir is None:
+        return compose(content)
+    path = cache_path(cache_dir, config_path, content, plugin_entries)
+    try:
+        with open(path, "rb") as cache_stream:
+            root = pickle.load(cache_stream)
+    except FileNotFoundError:
+        pass
+    except Exception as err:
+        _logger.warning("ignoring broken configuration cache %r: %s", path, err)
+    else:
+        if isinstance(root, nodes.Node):
+            _logger.info("using cached configuration %r", path)
+            return root
+    root = compose(content)
+    try:
+        _store(path, root)
+    except (OSError, pickle.PicklingError, RecursionError) as err:
+        _logger.warning("cannot write configuration cache %r: %s", path, err)
+    return root
+
+
+def _store(path: str, root: nodes.Node):
+    cache_dir, file_name = os.path.split(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = "%s.%d.tmp" % (path, os.getpid())
+    with open(temp_path, "wb") as cache_stream:
+        pickle.dump(root, cache_stream, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+    # remove cache files of previous versions of the same configuration
+    config_key = file_name.partition("-")[0]
+    for other in os.listdir(cache_dir):
+        if other.startswith(config_key + "-") and other != file_name:
+            if other.endswith(".pickle"):
+                try:
+                    os.remove(os.path.join(cache_dir, other))
+                except OSError:
+                    pass
@@ -0,0 +1,121 @@
+"""
+Dry-run of configurations without starting the daemon
+
+Checking a configuration loads and constructs all sections and pipelines,
+but does not run any services. Each phase of loading is timed separately.
+
+.. code:: bash
+
+    $ python3 -m cobald.daemon --check /etc/cobald/config.yaml
+    phase                        seconds  imports
+    parse                         0.0042        0
+    plugins                       0.1172       45
+    section pipeline              0.0026        3
+      pipeline kit                0.0015        3
+      pipeline desy               0.0009        0
+    total                         0.1240       48
+"""
+
+from typing import Iterator, List, NamedTuple, Optional, TextIO
+from contextlib import contextmanager
+import sys
+import time
+
+from ..runners.service import ServiceUnit
+from .config import load
+
+
+class Timing(NamedTuple):
+    """Cost of a single phase of loading a configuration"""
+
+    #: name of the phase, such as ``"parse"`` or ``"pipeline <name>"``
+    phase: str
+    #: wall clock time of the phase in seconds
+    seconds: float
+    #: number of modules imported during the phase
+    imports: int
+    #: number of phases this phase is nested in
+    depth: int = 0
+
+
+class _Timer(object):
+    """Timer of nested phases, storing timings in the order phases start"""
+
+    def __init__(self):
+        self.timings: List[Optional[Timing]] = []
+        self._depth = 0
+
+    @contextmanager
+    def __call__(self, phase: str):
+        index, depth = len(self.timings), self._depth
+        self.timings.append(None)
+        self._depth += 1
+        imports = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.timings[index] = Timing(
+                phase, time.perf_counter() - start, len(sys.modules) - imports, depth
+            )
+
+
+def check_configuration(
+    config_path: str, cache_dir: Optional[str] = None
+) -> Iterator[Timing]:
+    """
+    Load and construct a configuration, providing the timing of each phase
+
+    :param config_path: path to a configuration file
+    :param cache_dir: directory to cache parsed YAML configurations in
+
+    The configuration is loaded by :py:func:`~cobald.daemon.core.config.load`,
+    which defines the phases of loading.
+    Any error of the configuration is raised after the timings of all
+    preceding phases have been provided.
+    All services defined by the configuration are cancelled
+    once the check is done.
+    """
+    timer = _Timer()
+    failure = None
+    with ServiceUnit.collect() as units:
+        try:
+            with load(config_path, cache_dir=cache_dir, timer=timer):
+                pass
+        except Exception as err:
+            failure = err
+        finally:
+            for unit in units:
+                unit.cancel()
+    yield from timer.timings
+    if failure is not None:
+        raise failure
+
+
+def check(
+    config_path: str, cache_dir: Optional[str] = None, stream: TextIO = sys.stdout
+) -> int:
+    """
+    Check a configuration, writing a timing report to ``stream``
+
+    :return: exit code of the check, which is non-zero if the check failed
+    """
+    print("%-24s %11s %8s" % ("phase", "seconds", "imports"), file=stream)
+    total_seconds, total_imports = 0.0, 0
+    try:
+        for timing in check_configuration(config_path, cache_dir):
+            print(
+                "%-24s %11.4f %8d"
+                % ("  " * timing.depth + timing.phase, timing.seconds, timing.imports),
+                file=stream,
+            )
+            if timing.depth == 0:
+                total_seconds += timing.seconds
+                total_imports += timing.imports
+    except Exception as err:
+        print("%-24s %11.4f %8d" % ("total", total_seconds, total_imports), file=stream)
+        print("configuration %r is invalid: %s" % (config_path, err), file=stream)
+        return 1
+    print("%-24s %11.4f %8d" % ("total", total_seconds, total_imports), file=stream)
+    return 0
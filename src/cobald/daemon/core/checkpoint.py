@@ -0,0 +1,136 @@
+"""
+Periodic checkpoints of the state of all pipelines
+
+Checkpoints are stored as a single JSON document, mapping each pipeline
+to the state of its elements. The file is replaced atomically, so that an
+interrupted write never corrupts the previous checkpoint.
+"""
+
+from typing import Callable, Dict, List, Mapping, Sequence
+import json
+import logging
+import os
+import threading
+import time
+
+from ..runners.service import service
+from ...utility.checkpoint import get_state, set_state
+
+
+#: version of the checkpoint file format
+CHECKPOINT_VERSION = 1
+
+
+def _type_name(obj) -> str:
+    return "%s.%s" % (type(obj).__module__, type(obj).__qualname__)
+
+
+def pipeline_sections(content) -> Dict[str, Sequence]:
+    """Get all pipelines by name from the content of a ``pipeline`` section"""
+    if isinstance(content, dict):
+        return content
+    return {"pipeline": content}
+
+
+def collect_states(pipelines: Mapping[str, Sequence]) -> Dict[str, List[dict]]:
+    """Get the state of all elements of several ``pipelines``"""
+    return {
+        name: [
+            {"type": _type_name(element), "state": get_state(element)}
+            for element in elements
+        ]
+        for name, elements in pipelines.items()
+    }
+
+
+def restore_states(
+    pipelines: Mapping[str, Sequence], states: Mapping[str, List[dict]]
+) -> int:
+    """
+    Restore the state of all elements of several ``pipelines``
+
+    :return: the number of restored elements
+
+    Elements are matched by pipeline name, position and type;
+    elements without a matching state keep their initial state.
+    """
+    restored = 0
+    for name, elements in pipelines.items():
+        for element, element_state in zip(elements, states.get(name, ())):
+            if element_state["type"] != _type_name(element):
+                continue
+            if element_state["state"] is not None:
+                set_state(element, element_state["state"])
+                restored += 1
+    return restored
+
+
+def write_checkpoint(path: str, pipelines: Mapping[str, Sequence]) -> None:
+    """Atomically write a checkpoint of ``pipelines`` to ``path``"""
+    data = {
+        "version": CHECKPOINT_VERSION,
+        "time": time.time(),
+        "pipelines": collect_states(pipelines),
+    }
+    temp_path = "%s.%d.tmp" % (path, os.getpid())
+    with open(temp_path, "w") as checkpoint_stream:
+        json.dump(data, checkpoint_stream, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+def read_checkpoint(path: str, pipelines: Mapping[str, Sequence]) -> int:
+    """
+    Restore ``pipelines`` from a checkpoint at ``path``
+
+    :return: the number of restored elements
+
+    If there is no checkpoint at ``path``, nothing is restored.
+    """
+    try:
+        with open(path) as checkpoint_stream:
+            data = json.load(checkpoint_stream)
+    except FileNotFoundError:
+        return 0
+    if data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(
+            "unsupported checkpoint version %r in %r" % (data.get("version"), path)
+        )
+    return restore_states(pipelines, data["pipelines"])
+
+
+@service(flavour=threading)
+class Checkpointer(object):
+    """
+    Service periodically writing a checkpoint of pipelines
+
+    :param path: the file to write the checkpoint to
+    :param pipelines: callable providing all pipelines by name
+    :param interval: delay between checkpoints in seconds
+
+    The ``pipelines`` are provided by a callable, since they may
+    change while the daemon is running.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        pipelines: Callable[[], Mapping[str, Sequence]],
+        interval: float = 60,
+    ):
+        self.path = path
+        self.pipelines = pipelines
+        self.interval = interval
+        self._logger = logging.getLogger("cobald.runtime.checkpoint")
+
+    def checkpoint(self):
+        """Write a checkpoint of the current pipelines"""
+        try:
+            write_checkpoint(self.path, self.pipelines())
+        except (OSError, TypeError, ValueError):
+            # a failed checkpoint is not fatal, the next one may succeed
+            self._logger.exception("failed to write checkpoint %r", self.path)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            self.checkpoint()
@@ -1,7 +1,57 @@
 import argparse
+import math
+
+
+def buffer_size(value: str) -> float:
+    """Parse a buffer size, which is a non-negative integer or ``inf``"""
+    if value == "inf":
+        return math.inf
+    try:
+        size = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected an integer or 'inf', not %r" % value
+        ) from None
+    if size < 0:
+        raise argparse.ArgumentTypeError("buffer size must not be negative")
+    return size
+
 
 CLI = argparse.ArgumentParser(description="COBalD - the Opportunistic Balancing Daemon")
 CLI.add_argument("CONFIGURATION", help="path of the configuration to use", type=str)
+CLI.add_argument(
+    "--check",
+    help="construct the configuration without running it and report timings",
+    action="store_true",
+)
+CLI.add_argument(
+    "--reload",
+    help="reload changed pipelines of a YAML configuration on SIGHUP",
+    action="store_true",
+)
+CLI.add_argument(
+    "--checkpoint",
+    help="file to restore pipeline state from and to periodically store it to",
+    default=None,
+)
+CLI.add_argument(
+    "--checkpoint-interval",
+    help="delay between pipeline checkpoints in seconds",
+    default=60,
+    type=float,
+)
+CLI.add_argument(
+    "--config-workers",
+    help="number of threads constructing independent named pipelines",
+    default=1,
+    type=int,
+)
+CLI.add_argument(
+    "--config-cache",
+    help="directory to cache parsed YAML configurations in",
+    default=None,
+    metavar="DIR",
+)
 CLI_LOG = CLI.add_argument_group("Startup Logging")
 CLI_LOG.add_argument(
     "--log-level",
@@ -20,3 +70,45 @@ CLI_LOG.add_argument(
     help="use short formatting suitable for journals",
     action="store_true",
 )
+CLI_LOG.add_argument(
+    "--log-queue",
+    help="maximum number of records waiting to be written; 0 writes synchronously",
+    default=10000,
+    type=int,
+)
+CLI_LOG.add_argument(
+    "--log-overflow",
+    help="how to handle records if the log queue is full",
+    default="drop",
+    choices=["drop", "block"],
+)
+CLI_RUNTIME = CLI.add_argument_group("Runtime")
+CLI_RUNTIME.add_argument(
+    "--trio-buffer",
+    help="maximum number of trio payloads waiting to be started; inf for no limit",
+    default=math.inf,
+    type=buffer_size,
+)
+CLI_RUNTIME.add_argument(
+    "--thread-workers",
+    help="maximum number of threads for threading payloads; default is unlimited",
+    default=None,
+    type=int,
+)
+CLI_RUNTIME.add_argument(
+    "--thread-queue",
+    help="maximum number of threading payloads waiting for a thread; 0 for no limit",
+    default=0,
+    type=int,
+)
+CLI_RUNTIME.add_argument(
+    "--event-loop",
+    help="asyncio event loop hosting all runners; auto uses uvloop if available",
+    default="asyncio",
+    choices=["asyncio", "uvloop", "auto"],
+)
+CLI_RUNTIME.add_argument(
+    "--trio-guest",
+    help="run trio inside the asyncio event loop instead of a separate thread",
+    action="store_true",
+)
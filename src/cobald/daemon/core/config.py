@@ -1,23 +1,106 @@
+import io
 import os
-from contextlib import contextmanager
-from typing import Type, Tuple, Dict, Set
+import logging
+import functools
+import glob
+import itertools
+import string
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from typing import (
+    TYPE_CHECKING,
+    ContextManager,
+    Optional,
+    Type,
+    Tuple,
+    Dict,
+    Set,
+    List,
+    Any,
+    Callable,
+    Hashable,
+    Iterator,
+    NamedTuple,
+    Union,
+)
 
-from yaml import SafeLoader, BaseLoader
-from entrypoints import get_group_all as get_entrypoints
-from toposort import toposort_flatten
+from yaml import BaseLoader, nodes
+from yaml.resolver import Resolver
 
 from ..plugins import constraints as plugin_constraints, YAMLTagSettings
-from ..config.yaml import (
-    load_configuration as load_yaml_configuration,
-    yaml_constructor,
-)
+from ..config.yaml import yaml_constructor, SafeLoader
 from ..config.python import load_configuration as load_python_configuration
-from ..config.mapping import Translator, SectionPlugin
+from ..config.mapping import (
+    Translator,
+    SectionPlugin,
+    ConfigurationError,
+    load_configuration as load_mapping_configuration,
+)
+from ..runners.service import ServiceUnit
+from .cache import cached_compose
+from ...interfaces import Pool, Controller, PoolDecorator, CompositePool
 from ...interfaces._partial import Partial
 
+if TYPE_CHECKING:
+    from entrypoints import EntryPoint
+
 
 class COBalDLoader(SafeLoader):
-    """Loader with access to COBalD configuration constructors"""
+    """
+    Loader with access to COBalD configuration constructors
+
+    The loader uses the compiled ``CSafeLoader`` of :py:mod:`yaml` if
+    ``libyaml`` is available, and the pure Python ``SafeLoader`` otherwise.
+    """
+
+
+@functools.lru_cache(maxsize=None)
+def _entry_point_index(entry_point_group: str) -> Tuple["EntryPoint", ...]:
+    """All entry points of a group, without loading them"""
+    from entrypoints import get_group_all
+
+    return tuple(get_group_all(entry_point_group))
+
+
+class LazyConstructorPlugin(object):
+    """
+    PyYAML constructor that loads its plugin when its tag is first used
+
+    :param entry: entry point of the plugin
+    :param loader: the PyYAML loader which uses the plugin
+
+    Once loaded, the plugin replaces this constructor in the ``loader``.
+    """
+
+    def __init__(self, entry: "EntryPoint", loader: Type[BaseLoader]):
+        self.entry = entry
+        self.loader = loader
+        self.tag = "!" + entry.name
+        self._constructor = None
+
+    def resolve(self) -> Callable[[BaseLoader, nodes.Node], Any]:
+        """Load the plugin and provide its actual constructor"""
+        if self._constructor is None:
+            try:
+                pipeline_factory = self.entry.load().s
+            except AttributeError:
+                pipeline_factory = self.entry.load()
+            settings = YAMLTagSettings.fetch(pipeline_factory)
+            constructor = yaml_constructor(pipeline_factory, eager=settings.eager)
+            constructor.__plugin_entry__ = self.entry  # type: ignore
+            self._constructor = constructor
+            self.loader.add_constructor(tag=self.tag, constructor=self._constructor)
+        return self._constructor
+
+    def __call__(self, loader: BaseLoader, node: nodes.Node):
+        return self.resolve()(loader, node)
+
+    def __repr__(self):
+        return "%s(%r, loader=%s)" % (
+            self.__class__.__name__,
+            self.entry,
+            self.loader.__name__,
+        )
 
 
 def add_constructor_plugins(entry_point_group: str, loader: Type[BaseLoader]) -> None:
@@ -27,38 +110,48 @@ def add_constructor_plugins(entry_point_group: str, loader: Type[BaseLoader]) ->
     :param loader: the PyYAML loader which uses the plugins
     :param entry_point_group: entry point group to search
 
+    Each plugin is only loaded when its tag is first used by the ``loader``.
+
     .. note::
 
         This directly modifies the ``loader`` by
         calling :py:meth:`~.BaseLoader.add_constructor`.
     """
-    for entry in get_entrypoints(entry_point_group):
+    constructors = loader.yaml_constructors
+    for entry in _entry_point_index(entry_point_group):
         if entry.name[0] == "!":
             raise RuntimeError(
                 "plugin name %r in entry point group %r may not start with '!'"
                 % (entry.name, entry_point_group)
             )
-        try:
-            pipeline_factory = entry.load().s
-        except AttributeError:
-            pipeline_factory = entry.load()
-        settings = YAMLTagSettings.fetch(pipeline_factory)
+        # keep constructors from previous calls, which may already be loaded
+        current = constructors.get("!" + entry.name)
+        if (
+            isinstance(current, LazyConstructorPlugin)
+            and current.entry == entry
+            or getattr(current, "__plugin_entry__", None) == entry
+        ):
+            continue
         loader.add_constructor(
-            tag="!" + entry.name,
-            constructor=yaml_constructor(pipeline_factory, eager=settings.eager),
+            tag="!" + entry.name, constructor=LazyConstructorPlugin(entry, loader)
         )
 
 
+@functools.lru_cache(maxsize=None)
 def load_section_plugins(entry_point_group: str) -> Tuple[SectionPlugin]:
     """
     Load configuration plugins from an entry point group
 
     :param entry_point_group: entry point group to search
     :return: all loaded plugins
+
+    The plugins are loaded only once for each group.
     """
+    from toposort import toposort_flatten
+
     plugins: Dict[str, SectionPlugin] = {
         plugin.section: plugin
-        for plugin in map(SectionPlugin.load, get_entrypoints(entry_point_group))
+        for plugin in map(SectionPlugin.load, _entry_point_index(entry_point_group))
     }
     dependencies: Dict[str, Set[str]] = {
         plugin.section: set(plugin.after) for plugin in plugins.values()
@@ -74,25 +167,40 @@ def load_section_plugins(entry_point_group: str) -> Tuple[SectionPlugin]:
 
 
 @contextmanager
-def load(config_path: str):
+def load(
+    config_path: str,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+    timer: Callable[[str], ContextManager] = nullcontext,
+):
     """
     Load a configuration and keep it alive for the given context
 
     :param config_path: path to a configuration file
+    :param workers: number of threads constructing independent pipelines
+    :param cache_dir: directory to cache parsed YAML configurations in
+    :param timer: context manager factory wrapping each phase of loading
+
+    If the ``pipeline`` section of a YAML configuration is a mapping of named
+    pipelines, each pipeline is constructed separately; if ``workers`` is larger
+    than one, these pipelines are constructed concurrently. Pipelines sharing
+    YAML anchors with other pipelines or sections are constructed together.
+
+    If ``cache_dir`` is set, the parsed YAML configuration is cached
+    as described in :py:mod:`cobald.daemon.core.cache`.
+
+    The ``timer`` is called with the name of each phase, such as ``"parse"``,
+    ``"plugins"``, ``"section <name>"`` and ``"pipeline <name>"``, and
+    may for example measure its duration as done by :py:mod:`~.check`.
+    The phases of pipelines are nested in the phase of the ``pipeline`` section.
+    If ``workers`` is larger than one, ``timer`` must be thread-safe.
     """
     # we bind the config to c to keep it alive
     if os.path.splitext(config_path)[1] in (".yaml", ".yml"):
-        add_constructor_plugins(
-            "cobald.config.yaml_constructors", COBalDLoader  # type: ignore
-        )
-        config_plugins = load_section_plugins("cobald.config.sections")
-        c = load_yaml_configuration(
-            config_path,
-            loader=COBalDLoader,  # type: ignore
-            plugins=config_plugins,
-        )
+        c = _load_yaml(config_path, workers, cache_dir, timer)
     elif os.path.splitext(config_path)[1] == ".py":
-        c = load_python_configuration(config_path)
+        with timer("configuration"):
+            c = load_python_configuration(config_path)
     else:
         raise ValueError(
             "Unknown configuration extension: %r" % os.path.splitext(config_path)[1]
@@ -101,18 +209,738 @@ def load(config_path: str):
     yield c
 
 
+def _load_yaml(
+    config_path: str,
+    workers: int,
+    cache_dir: Optional[str],
+    timer: Callable[[str], ContextManager],
+) -> Dict[SectionPlugin, Any]:
+    with timer("parse"):
+        root = _compose(config_path, cache_dir)
+    with timer("plugins"):
+        plugins = _load_yaml_plugins()
+    sections, pipeline_node = _split_root(root)
+    # independent pipelines are constructed one by one, so that each template
+    # instance is only expanded when its pipeline is constructed
+    if isinstance(pipeline_node, nodes.MappingNode) and _independent(
+        sections, *(value for _, value in pipeline_node.value)
+    ):
+        pipeline_plugin = next(
+            plugin for plugin in plugins if plugin.section == "pipeline"
+        )
+        separate_plugin = SectionPlugin(
+            section="pipeline",
+            digest=functools.partial(
+                _digest_pipelines,
+                digest=pipeline_plugin.digest,
+                workers=workers,
+                timer=timer,
+            ),
+            requirements=pipeline_plugin.requirements,
+        )
+        config_data = _construct(sections)
+        config_data["pipeline"] = _split_pipelines(pipeline_node)
+        return load_mapping_configuration(
+            config_data=config_data,
+            plugins=tuple(
+                separate_plugin if plugin is pipeline_plugin else plugin
+                for plugin in plugins
+            ),
+            timer=timer,
+        )
+    return load_mapping_configuration(
+        config_data=_construct(_expand_instances(root)), plugins=plugins, timer=timer
+    )
+
+
+def _load_yaml_plugins() -> Tuple[SectionPlugin]:
+    """Prepare the :py:class:`~.COBalDLoader` and fetch all section plugins"""
+    add_constructor_plugins(
+        "cobald.config.yaml_constructors", COBalDLoader  # type: ignore
+    )
+    return load_section_plugins("cobald.config.sections")
+
+
 @plugin_constraints(required=True)
-def load_pipeline(content: list):
+def load_pipeline(content: Union[list, dict]):
     """
     Load a cobald pipeline of Controller >> ... >> Pool from a configuration section
 
     :param content: content of the configuration section
     :return:
+
+    The ``content`` is either a single pipeline or a mapping of names to pipelines.
     """
     translator = PipelineTranslator()
+    if isinstance(content, dict):
+        return {
+            name: translator.translate_hierarchy(
+                {"pipeline": pipeline}, where=".%s" % name
+            )
+            for name, pipeline in content.items()
+        }
     return translator.translate_hierarchy({"pipeline": content})
 
 
+def _node_signature(node: nodes.Node) -> Hashable:
+    """Identity of a YAML node based on its content"""
+    if isinstance(node, TemplateInstance):
+        return _node_signature(node.template), tuple(node.parameters.items())
+    elif isinstance(node, nodes.ScalarNode):
+        return node.tag, node.value
+    elif isinstance(node, nodes.SequenceNode):
+        return node.tag, tuple(_node_signature(item) for item in node.value)
+    else:
+        return node.tag, tuple(
+            (_node_signature(key), _node_signature(value)) for key, value in node.value
+        )
+
+
+def _node_ids(node: nodes.Node) -> Set[int]:
+    """Identities of ``node`` and all nodes nested in it"""
+    seen: Set[int] = set()
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, nodes.SequenceNode):
+            pending.extend(node.value)
+        elif isinstance(node, nodes.MappingNode):
+            for key, value in node.value:
+                pending.append(key)
+                pending.append(value)
+    return seen
+
+
+def _independent(*roots: nodes.Node) -> bool:
+    """Whether YAML nodes do not share any nested nodes via anchors and aliases"""
+    seen: Set[int] = set()
+    for root in roots:
+        node_ids = _node_ids(root)
+        if not seen.isdisjoint(node_ids):
+            return False
+        seen |= node_ids
+    return True
+
+
+def _compose(config_path: str, cache_dir: Optional[str] = None) -> nodes.MappingNode:
+    """
+    Compose the YAML node tree of a configuration file
+
+    All documents of the configuration and its included files are merged into
+    a single root node, and pipeline templates are split into their instances.
+    The node trees of all documents are composed before any of them is
+    constructed: sections may be defined in any document, yet their plugins
+    must be applied in order.
+    """
+    documents = _compose_documents(config_path, cache_dir, ())
+    if len(documents) == 1:
+        return _expand_templates(documents[0][1])
+    return _expand_templates(_merge_documents(documents))
+
+
+def _compose_documents(
+    config_path: str, cache_dir: Optional[str], parents: Tuple[str, ...]
+) -> List[Tuple[str, nodes.MappingNode]]:
+    """Compose all documents of a file and its includes in order"""
+    real_path = os.path.realpath(config_path)
+    if real_path in parents:
+        raise ConfigurationError(where=config_path, what="recursive include")
+    with open(config_path, "rb") as yaml_stream:
+        content = yaml_stream.read()
+    stream = cached_compose(
+        cache_dir,
+        config_path,
+        content,
+        functools.partial(_compose_content, config_path),
+        plugin_entries=(
+            *_entry_point_index("cobald.config.yaml_constructors"),
+            *_entry_point_index("cobald.config.sections"),
+        ),
+    )
+    documents = []
+    for document in stream.value:
+        if not isinstance(document, nodes.MappingNode):
+            raise ConfigurationError(
+                where=config_path, what="configuration must be a mapping"
+            )
+        includes, pairs = [], []
+        for key, value in document.value:
+            if isinstance(key, nodes.ScalarNode) and key.value == "include":
+                includes.append(value)
+            else:
+                pairs.append((key, value))
+        if not includes:
+            documents.append((config_path, document))
+            continue
+        documents.append(
+            (
+                config_path,
+                nodes.MappingNode(
+                    document.tag,
+                    pairs,
+                    document.start_mark,
+                    document.end_mark,
+                    document.flow_style,
+                ),
+            )
+        )
+        for include in includes:
+            for include_path in _include_paths(config_path, include):
+                documents.extend(
+                    _compose_documents(include_path, cache_dir, (*parents, real_path))
+                )
+    return documents
+
+
+def _compose_content(config_path: str, content: bytes) -> nodes.SequenceNode:
+    """Compose all documents of a configuration as a sequence"""
+    yaml_stream = io.BytesIO(content)
+    # the name of the stream is used in error messages
+    yaml_stream.name = config_path  # type: ignore
+    loader = COBalDLoader(yaml_stream)
+    try:
+        documents = []
+        while loader.check_node():
+            documents.append(loader.get_node())
+    finally:
+        loader.dispose()
+    return nodes.SequenceNode("tag:yaml.org,2002:seq", documents)
+
+
+def _include_paths(config_path: str, include: nodes.Node) -> List[str]:
+    """Resolve the paths of an ``include`` relative to ``config_path``"""
+    if isinstance(include, nodes.ScalarNode):
+        patterns = [include]
+    elif isinstance(include, nodes.SequenceNode) and all(
+        isinstance(pattern, nodes.ScalarNode) for pattern in include.value
+    ):
+        patterns = include.value
+    else:
+        raise ConfigurationError(
+            where="%s.include" % config_path,
+            what="must be a path or a sequence of paths",
+        )
+    base_dir = os.path.dirname(config_path)
+    paths = []
+    for pattern in patterns:
+        path_pattern = os.path.join(base_dir, os.path.expanduser(pattern.value))
+        matches = sorted(glob.glob(path_pattern))
+        if not matches and path_pattern == glob.escape(path_pattern):
+            raise ConfigurationError(
+                where="%s.include" % config_path,
+                what="no such file %r" % path_pattern,
+            )
+        paths.extend(matches)
+    return paths
+
+
+def _merge_documents(
+    documents: List[Tuple[str, nodes.MappingNode]],
+) -> nodes.MappingNode:
+    """
+    Merge several configuration documents into a single root node
+
+    Named pipelines of all documents are combined; every other section
+    may only be defined once.
+    """
+    pairs: List[Tuple[nodes.Node, nodes.Node]] = []
+    sections: Dict[Any, str] = {}
+    pipelines: Optional[nodes.MappingNode] = None
+    for where, document in documents:
+        for key, value in document.value:
+            section = getattr(key, "value", key)
+            if section == "pipeline" and pipelines is not None:
+                if not isinstance(value, nodes.MappingNode) or not isinstance(
+                    pipelines, nodes.MappingNode
+                ):
+                    raise ConfigurationError(
+                        where=where,
+                        what="pipelines of several documents must be named",
+                    )
+                pipelines.value.extend(value.value)
+                continue
+            if section in sections:
+                raise ConfigurationError(
+                    where=where,
+                    what="section %r is already defined in %s"
+                    % (section, sections[section]),
+                )
+            sections[section] = where
+            if section == "pipeline":
+                if isinstance(value, nodes.MappingNode):
+                    # copy the pipelines to extend them with other documents
+                    value = nodes.MappingNode(
+                        value.tag,
+                        list(value.value),
+                        value.start_mark,
+                        value.end_mark,
+                        value.flow_style,
+                    )
+                pipelines = value
+            pairs.append((key, value))
+    if isinstance(pipelines, nodes.MappingNode):
+        names = [getattr(name, "value", name) for name, _ in pipelines.value]
+        if len(set(names)) != len(names):
+            raise ConfigurationError(
+                where="pipeline", what="pipeline names are not unique"
+            )
+    return nodes.MappingNode("tag:yaml.org,2002:map", pairs)
+
+
+def _split_root(root: nodes.MappingNode) -> Tuple[nodes.MappingNode, nodes.Node]:
+    """Split the root node into the ``pipeline`` node and all other sections"""
+    pipeline_node = None
+    section_pairs = []
+    for key, value in root.value:
+        if isinstance(key, nodes.ScalarNode) and key.value == "pipeline":
+            pipeline_node = value
+        else:
+            section_pairs.append((key, value))
+    if pipeline_node is None:
+        raise ConfigurationError(where="root", what="missing section 'pipeline'")
+    return nodes.MappingNode(tag=root.tag, value=section_pairs), pipeline_node
+
+
+def _expand_templates(root: nodes.MappingNode) -> nodes.MappingNode:
+    """Expand all pipeline templates in the root node of a configuration"""
+    for index, (key, value) in enumerate(root.value):
+        if not (isinstance(key, nodes.ScalarNode) and key.value == "pipeline"):
+            continue
+        if isinstance(value, nodes.MappingNode) and any(
+            isinstance(pipeline, nodes.MappingNode) for _, pipeline in value.value
+        ):
+            pairs = []
+            for name, pipeline in value.value:
+                if isinstance(pipeline, nodes.MappingNode):
+                    pairs.extend(_expand_template(name, pipeline))
+                else:
+                    pairs.append((name, pipeline))
+            names = [name.value for name, _ in pairs]
+            if len(set(names)) != len(names):
+                raise ConfigurationError(
+                    where="pipeline", what="pipeline names are not unique"
+                )
+            expanded = nodes.MappingNode(
+                value.tag, pairs, value.start_mark, value.end_mark, value.flow_style
+            )
+            root = nodes.MappingNode(
+                root.tag,
+                [*root.value[:index], (key, expanded), *root.value[index + 1 :]],
+                root.start_mark,
+                root.end_mark,
+                root.flow_style,
+            )
+    return root
+
+
+def _expand_template(
+    name: nodes.Node, definition: nodes.MappingNode
+) -> Iterator[Tuple[nodes.Node, nodes.Node]]:
+    """Expand a pipeline template to the name and node of each pipeline"""
+    where = "pipeline.%s" % getattr(name, "value", name)
+    fields = {getattr(key, "value", None): value for key, value in definition.value}
+    if fields.keys() != {"template", "matrix"}:
+        raise ConfigurationError(
+            where=where, what="a template requires exactly 'template' and 'matrix'"
+        )
+    for parameters in _matrix_parameters(_construct(fields["matrix"]), where):
+        try:
+            instance_name = _substitute(name, parameters, {})
+        except (KeyError, ValueError) as err:
+            raise ConfigurationError(
+                where=where, what="invalid template placeholder %s" % err
+            ) from err
+        yield instance_name, TemplateInstance(fields["template"], parameters, where)
+
+
+class TemplateInstance(nodes.Node):
+    """
+    YAML node of a pipeline created from a template, expanded only on demand
+
+    :param template: the node of the template shared by all its instances
+    :param parameters: the values of the template placeholders for this instance
+    :param where: the location of the template for error messages
+
+    The node tree of the instance is created by :py:meth:`expand`
+    when the pipeline is constructed, and is not kept afterwards.
+    """
+
+    id = "template"
+
+    def __init__(self, template: nodes.Node, parameters: Dict[str, str], where: str):
+        super().__init__(template.tag, None, template.start_mark, template.end_mark)
+        self.template = template
+        self.parameters = parameters
+        self.where = where
+
+    def expand(self) -> nodes.Node:
+        """Create the node tree of the instance"""
+        try:
+            return _substitute(self.template, self.parameters, {})
+        except (KeyError, ValueError) as err:
+            raise ConfigurationError(
+                where=self.where, what="invalid template placeholder %s" % err
+            ) from err
+
+
+def _matrix_parameters(matrix, where: str) -> List[Dict[str, str]]:
+    """Get every combination of the parameters of a template ``matrix``"""
+    if not isinstance(matrix, dict) or not matrix:
+        raise ConfigurationError(
+            where=where, what="'matrix' must be a mapping of parameters"
+        )
+    axes = []
+    for parameter, values in matrix.items():
+        if isinstance(values, dict):
+            if not values.keys() <= {"start", "stop", "step"}:
+                raise ConfigurationError(
+                    where=where,
+                    what="range of %r only supports 'start', 'stop' and 'step'"
+                    % parameter,
+                )
+            try:
+                values = range(
+                    values.get("start", 0), values["stop"], values.get("step", 1)
+                )
+            except (KeyError, TypeError, ValueError) as err:
+                raise ConfigurationError(
+                    where=where, what="invalid range of %r: %s" % (parameter, err)
+                ) from err
+        elif not isinstance(values, list):
+            raise ConfigurationError(
+                where=where,
+                what="values of %r must be a sequence or range" % parameter,
+            )
+        axes.append([str(value) for value in values])
+    return [
+        dict(zip(matrix.keys(), combination))
+        for combination in itertools.product(*axes)
+    ]
+
+
+_resolver = Resolver()
+
+
+def _substitute(
+    node: nodes.Node, parameters: Dict[str, str], memo: Dict[int, nodes.Node]
+) -> nodes.Node:
+    """Copy a ``node`` tree, substituting ``$parameter`` in all scalars"""
+    try:
+        return memo[id(node)]
+    except KeyError:
+        pass
+    if isinstance(node, nodes.ScalarNode):
+        value, tag = node.value, node.tag
+        if "$" in value:
+            value = string.Template(value).substitute(parameters)
+            # the tag of plain scalars is derived from their value
+            if not node.style and tag == _resolver.resolve(
+                nodes.ScalarNode, node.value, (True, False)
+            ):
+                tag = _resolver.resolve(nodes.ScalarNode, value, (True, False))
+        copy = memo[id(node)] = nodes.ScalarNode(
+            tag, value, node.start_mark, node.end_mark, node.style
+        )
+        return copy
+    copy = memo[id(node)] = type(node)(
+        node.tag, [], node.start_mark, node.end_mark, node.flow_style
+    )
+    if isinstance(node, nodes.SequenceNode):
+        copy.value.extend(_substitute(item, parameters, memo) for item in node.value)
+    else:
+        copy.value.extend(
+            (_substitute(key, parameters, memo), _substitute(value, parameters, memo))
+            for key, value in node.value
+        )
+    return copy
+
+
+def _expand_instances(root: nodes.MappingNode) -> nodes.MappingNode:
+    """Expand all template instances of the ``pipeline`` section of ``root``"""
+    pairs = []
+    for key, value in root.value:
+        if (
+            isinstance(key, nodes.ScalarNode)
+            and key.value == "pipeline"
+            and isinstance(value, nodes.MappingNode)
+        ):
+            value = nodes.MappingNode(
+                value.tag,
+                [(name, _expanded(pipeline)) for name, pipeline in value.value],
+                value.start_mark,
+                value.end_mark,
+                value.flow_style,
+            )
+        pairs.append((key, value))
+    return nodes.MappingNode(
+        root.tag, pairs, root.start_mark, root.end_mark, root.flow_style
+    )
+
+
+def _expanded(node: nodes.Node) -> nodes.Node:
+    """Expand ``node`` if it is an instance of a pipeline template"""
+    return node.expand() if isinstance(node, TemplateInstance) else node
+
+
+def _construct(node: nodes.Node):
+    """Construct the data of a YAML ``node`` with a new loader"""
+    # each loader tracks the objects it constructs, so using a separate loader
+    # allows to construct several nodes concurrently
+    loader = COBalDLoader("")
+    try:
+        return loader.construct_document(_expanded(node))
+    finally:
+        loader.dispose()
+
+
+def _split_pipelines(node: nodes.Node) -> Dict[str, nodes.Node]:
+    """Get the node of each pipeline by name"""
+    if isinstance(node, nodes.SequenceNode):
+        return {"pipeline": node}
+    elif isinstance(node, nodes.MappingNode):
+        return {_construct(key): value for key, value in node.value}
+    raise ConfigurationError(
+        where="pipeline", what="must be a sequence or a mapping of sequences"
+    )
+
+
+class LivePipeline(NamedTuple):
+    """A pipeline constructed from a YAML node"""
+
+    #: identity of the YAML node the pipeline was constructed from
+    signature: Hashable
+    #: the constructed pipeline elements
+    content: Any
+    #: service units defined while constructing the pipeline
+    units: List[ServiceUnit]
+
+    def cancel(self):
+        """
+        Stop all services of the pipeline and disable all its pools
+
+        Pools are disabled by setting their ``demand`` to ``0``, which also
+        shuts down children created by pools while the pipeline was running.
+        """
+        for unit in self.units:
+            unit.cancel()
+        for pool in _pipeline_pools(self.content):
+            try:
+                pool.demand = 0
+            except Exception:
+                logging.getLogger("cobald.runtime.config").exception(
+                    "failed to disable pool %r", pool
+                )
+
+
+def _pipeline_pools(content) -> Iterator[Pool]:
+    """Find all pools used by the elements of pipelines, including children"""
+    seen: Set[int] = set()
+    pending = [content]
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, (list, tuple)):
+            pending.extend(item)
+        elif isinstance(item, dict):
+            pending.extend(item.values())
+        elif isinstance(item, (Controller, PoolDecorator)):
+            pending.append(item.target)
+        if isinstance(item, CompositePool):
+            pending.extend(item.children)
+        if isinstance(item, Pool):
+            yield item
+
+
+def _construct_pipeline(
+    name: str,
+    node: nodes.Node,
+    digest: Callable[[Any], Any],
+    timer: Callable[[str], ContextManager],
+    held: "Optional[List[ServiceUnit]]" = None,
+) -> LivePipeline:
+    logging.getLogger("cobald.runtime.config").info("constructing pipeline %r", name)
+    # a helper thread must respect the hold of the thread loading the config
+    hold = ServiceUnit.hold(held) if held is not None else nullcontext()
+    with hold, timer("pipeline %s" % name), ServiceUnit.collect() as units:
+        content = digest(_construct(node))
+    return LivePipeline(_node_signature(node), content, units)
+
+
+def construct_pipelines(
+    pipeline_nodes: Dict[str, nodes.Node],
+    digest: Callable[[Any], Any],
+    workers: int = 1,
+    timer: Callable[[str], ContextManager] = nullcontext,
+) -> Dict[str, LivePipeline]:
+    """
+    Construct several pipelines from their YAML nodes
+
+    :param pipeline_nodes: the YAML node of each pipeline by name
+    :param digest: callable translating the data of a node to a pipeline
+    :param workers: number of threads constructing pipelines concurrently
+    :param timer: context manager factory wrapping the phase of each pipeline
+
+    Each pipeline is constructed separately, binding its elements from right
+    to left as usual. If constructing any pipeline fails, the services of all
+    other pipelines are cancelled and the first error is raised.
+    """
+    pipelines: Dict[str, LivePipeline] = {}
+    failure = None
+    if workers <= 1 or len(pipeline_nodes) <= 1:
+        try:
+            for name, node in pipeline_nodes.items():
+                pipelines[name] = _construct_pipeline(name, node, digest, timer)
+        except BaseException as err:  # noqa: B036
+            failure = err
+    else:
+        held = ServiceUnit.held()
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="cobald-config"
+        ) as executor:
+            futures = {
+                name: executor.submit(
+                    _construct_pipeline, name, node, digest, timer, held
+                )
+                for name, node in pipeline_nodes.items()
+            }
+        for name, future in futures.items():
+            try:
+                pipelines[name] = future.result()
+            except BaseException as err:  # noqa: B036
+                failure = err if failure is None else failure
+    if failure is not None:
+        for pipeline in pipelines.values():
+            pipeline.cancel()
+        raise failure
+    return pipelines
+
+
+def _digest_pipelines(
+    pipeline_nodes: Dict[str, nodes.Node],
+    digest: Callable[[Any], Any],
+    workers: int,
+    timer: Callable[[str], ContextManager],
+) -> Dict[str, Any]:
+    return {
+        name: pipeline.content
+        for name, pipeline in construct_pipelines(
+            pipeline_nodes, digest, workers, timer
+        ).items()
+    }
+
+
+class ReloadableConfiguration(object):
+    """
+    YAML configuration whose pipelines can be reloaded while the daemon is running
+
+    :param config_path: path to a YAML configuration file
+    :param workers: number of threads constructing pipelines concurrently
+    :param cache_dir: directory to cache parsed YAML configurations in
+
+    Every :py:meth:`reload` compares each pipeline against the running pipelines;
+    only new and changed pipelines are constructed, while all services of
+    changed and removed pipelines are cancelled. Unchanged pipelines and their
+    state are kept as-is.
+    Changes to other sections are only applied when the daemon is restarted.
+
+    The ``pipeline`` section may be a mapping of names to pipelines, in which case
+    pipelines are identified by their name.
+    Each pipeline is constructed on its own, so YAML anchors and aliases are not
+    shared between different pipelines.
+    """
+
+    def __init__(
+        self, config_path: str, workers: int = 1, cache_dir: Optional[str] = None
+    ):
+        self.config_path = config_path
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self._logger = logging.getLogger("cobald.runtime.config")
+        self._pipeline_plugin = None
+        self._sections_signature = None
+        # plugins applied after the first pipelines, and their sections
+        self._late_plugins: Tuple[SectionPlugin, ...] = ()
+        self._late_sections: Dict[str, Any] = {}
+        #: the output of all section plugins except pipelines
+        self.content: Dict[SectionPlugin, Any] = {}
+        #: all currently running pipelines by name
+        self.pipelines: Dict[str, LivePipeline] = {}
+
+    def reload(self):
+        """
+        (Re-)load the configuration and apply changes to pipelines
+
+        If constructing any pipeline fails, the previous pipelines are kept.
+        """
+        sections, pipeline_node = _split_root(
+            _compose(self.config_path, self.cache_dir)
+        )
+        if self._pipeline_plugin is None:
+            self._load_sections(sections)
+        elif _node_signature(sections) != self._sections_signature:
+            self._logger.warning(
+                "changes to sections other than 'pipeline' require a restart"
+            )
+        self._update_pipelines(_split_pipelines(pipeline_node))
+        if self._late_plugins:
+            self.content.update(
+                load_mapping_configuration(
+                    config_data=self._late_sections, plugins=self._late_plugins
+                )
+            )
+            self._late_plugins, self._late_sections = (), {}
+
+    def _load_sections(self, sections: nodes.MappingNode):
+        """Apply the plugins ordered before ``pipeline``, deferring all others"""
+        plugins = _load_yaml_plugins()
+        pipeline_index, self._pipeline_plugin = next(
+            (index, plugin)
+            for index, plugin in enumerate(plugins)
+            if plugin.section == "pipeline"
+        )
+        config_data = _construct(sections)
+        self._late_plugins = plugins[pipeline_index + 1 :]
+        self._late_sections = {
+            plugin.section: config_data.pop(plugin.section)
+            for plugin in self._late_plugins
+            if plugin.section in config_data
+        }
+        self.content = load_mapping_configuration(
+            config_data=config_data, plugins=plugins[:pipeline_index]
+        )
+        self._sections_signature = _node_signature(sections)
+
+    def _update_pipelines(self, pipeline_nodes: Dict[str, nodes.Node]):
+        previous = self.pipelines
+        unchanged = {
+            name: previous[name]
+            for name, node in pipeline_nodes.items()
+            if name in previous and previous[name].signature == _node_signature(node)
+        }
+        created = construct_pipelines(
+            {
+                name: node
+                for name, node in pipeline_nodes.items()
+                if name not in unchanged
+            },
+            self._pipeline_plugin.digest,
+            workers=self.workers,
+        )
+        for name, pipeline in previous.items():
+            if name not in unchanged:
+                self._logger.info("stopping pipeline %r", name)
+                pipeline.cancel()
+        self.pipelines = {
+            name: unchanged[name] if name in unchanged else created[name]
+            for name in pipeline_nodes
+        }
+
+
 class PipelineTranslator(Translator):
     """
     Translator for :py:mod:`cobald` pipelines
@@ -131,6 +959,9 @@ class PipelineTranslator(Translator):
             - __type__: package.module.Pool
     """
 
+    def _delegate(self, structure):
+        return isinstance(structure, dict) and "pipeline" in structure
+
     def translate_hierarchy(self, structure, *, where="", **construct_kwargs):
         try:
             pipeline = structure["pipeline"]
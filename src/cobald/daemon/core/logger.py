@@ -1,8 +1,14 @@
 import sys
+import atexit
+import queue
 import logging
 import logging.handlers
 
 
+#: policies for handling records when the logging queue is full
+OVERFLOW_POLICIES = ("drop", "block")
+
+
 def create_handler(target: str):
     """Create a handler for logging to ``target``"""
     if target == "stderr":
@@ -13,8 +19,110 @@ def create_handler(target: str):
         return logging.handlers.WatchedFileHandler(filename=target)
 
 
-def initialise_logging(level: str, target: str, short_format: bool):
-    """Initialise basic logging facilities"""
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Handler that passes records to a bounded queue
+
+    :param log_queue: the queue to put records into
+    :param overflow: policy if the queue is full, either ``"drop"`` or ``"block"``
+
+    With the ``"drop"`` policy, records that do not fit into the queue are
+    discarded and counted in :py:attr:`dropped`. A warning about discarded
+    records is queued once the queue has capacity again.
+    With the ``"block"`` policy, the emitting thread waits until the queue
+    has capacity again.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: str = "drop"):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                "overflow policy must be one of %s, not %r"
+                % (", ".join(map(repr, OVERFLOW_POLICIES)), overflow)
+            )
+        super().__init__(log_queue)
+        self.overflow = overflow
+        #: number of records discarded due to a full queue
+        self.dropped = 0
+        self._reported = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.overflow == "block":
+            self.queue.put(record, block=True)
+        else:
+            try:
+                if self.dropped > self._reported:
+                    self.queue.put_nowait(self.dropped_record())
+                    self._reported = self.dropped
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+
+    def dropped_record(self) -> logging.LogRecord:
+        """Create a warning about all records dropped since the last warning"""
+        return self.prepare(
+            logging.LogRecord(
+                name=__name__,
+                level=logging.WARNING,
+                pathname=__file__,
+                lineno=0,
+                msg="dropped %d log records due to a full log queue",
+                args=(self.dropped - self._reported,),
+                exc_info=None,
+            )
+        )
+
+
+def create_queue_handler(
+    handler: logging.Handler, queue_size: int, overflow: str = "drop"
+) -> BoundedQueueHandler:
+    """
+    Create a handler that moves records to ``handler`` via a background thread
+
+    :param handler: the handler performing the actual I/O
+    :param queue_size: maximum number of records waiting for ``handler``
+    :param overflow: policy if the queue is full, either ``"drop"`` or ``"block"``
+
+    The background thread is stopped and all pending records are flushed
+    when the interpreter exits. Any records dropped since the last warning
+    about dropped records are then reported directly to ``handler``.
+    """
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, overflow=overflow)
+    # records are fully formatted by ``handler`` in the background thread.
+    # The queue handler only merges message and arguments since objects in the
+    # arguments may change before the record is processed.
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(_stop_listener, listener, queue_handler, handler)
+    return queue_handler
+
+
+def _stop_listener(
+    listener: logging.handlers.QueueListener,
+    queue_handler: BoundedQueueHandler,
+    handler: logging.Handler,
+):
+    listener.stop()
+    if queue_handler.dropped > queue_handler._reported:
+        handler.handle(queue_handler.dropped_record())
+
+
+def initialise_logging(
+    level: str,
+    target: str,
+    short_format: bool,
+    queue_size: int = 0,
+    overflow: str = "drop",
+):
+    """
+    Initialise basic logging facilities
+
+    If ``queue_size`` is positive, records are written to ``target`` by a
+    background thread. This avoids blocking the daemon on slow log targets.
+    """
     try:
         log_level = getattr(logging, level)
     except AttributeError:
@@ -23,13 +131,16 @@ def initialise_logging(level: str, target: str, short_format: bool):
             "'INFO', 'WARNING', 'ERROR' or 'CRITICAL'" % level
         ) from None
     handler = create_handler(target=target)
-    logging.basicConfig(
-        level=log_level,
-        format=(
-            "%(asctime)-15s (%(process)d) %(message)s"
-            if not short_format
-            else "%(message)s"
-        ),
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[handler],
+    handler.setFormatter(
+        logging.Formatter(
+            (
+                "%(asctime)-15s (%(process)d) %(message)s"
+                if not short_format
+                else "%(message)s"
+            ),
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
     )
+    if queue_size > 0:
+        handler = create_queue_handler(handler, queue_size, overflow=overflow)
+    logging.basicConfig(level=log_level, handlers=[handler])
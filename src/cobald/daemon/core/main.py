@@ -2,22 +2,56 @@
 Daemon core specific to cobald
 """
 
+from typing import Optional, Callable, Mapping, Sequence
 import asyncio
+import atexit
+import contextlib
 import sys
 import logging
 import platform
+import threading
+import signal
+import os
+
+import trio
 
 import cobald.__about__
 
 from .logger import initialise_logging
 from .cli import CLI
-from .config import load
+from .config import load, ReloadableConfiguration
+from .check import check
+from .checkpoint import Checkpointer, read_checkpoint, pipeline_sections
 from .. import runtime
+from ..runners.service import ServiceUnit
 
 
-def run(configuration: str, level: str, target: str, short_format: bool):
+def run(
+    configuration: str,
+    level: str,
+    target: str,
+    short_format: bool,
+    log_queue: int = 0,
+    log_overflow: str = "drop",
+    trio_buffer: float = float("inf"),
+    trio_guest: bool = False,
+    thread_workers: Optional[int] = None,
+    thread_queue: int = 0,
+    event_loop: str = "asyncio",
+    reload: bool = False,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = 60,
+    config_workers: int = 1,
+    config_cache: Optional[str] = None,
+):
     """Run the daemon and all its services"""
-    initialise_logging(level=level, target=target, short_format=short_format)
+    initialise_logging(
+        level=level,
+        target=target,
+        short_format=short_format,
+        queue_size=log_queue,
+        overflow=log_overflow,
+    )
     logger = logging.getLogger(__package__)
     logger.info("COBalD %s", cobald.__about__.__version__)
     logger.info(cobald.__about__.__url__)
@@ -30,25 +64,166 @@ def run(configuration: str, level: str, target: str, short_format: bool):
     logger.debug(cobald.__about__.__file__)
     logger.info("Using configuration %s", configuration)
     logger.info("Starting daemon services...")
-    runtime.adopt(_load_services, configuration, flavour=asyncio)
+    try:
+        runtime.configure_event_loop(event_loop)
+    except ImportError as err:
+        raise SystemExit(f"event loop {event_loop!r} is not available: {err}") from None
+    runtime.configure_runner(trio, max_buffer_size=trio_buffer, guest=trio_guest)
+    runtime.configure_runner(
+        threading, max_workers=thread_workers, max_queue=thread_queue
+    )
+    is_yaml = os.path.splitext(configuration)[1] in (".yaml", ".yml")
+    if reload and not is_yaml:
+        raise SystemExit("reloading is only supported for YAML configurations")
+    if checkpoint is not None and not is_yaml:
+        raise SystemExit("checkpoints are only supported for YAML configurations")
+    if reload:
+        runtime.adopt(
+            _reload_services,
+            configuration,
+            checkpoint,
+            checkpoint_interval,
+            config_workers,
+            config_cache,
+            flavour=asyncio,
+        )
+    else:
+        runtime.adopt(
+            _load_services,
+            configuration,
+            checkpoint,
+            checkpoint_interval,
+            config_workers,
+            config_cache,
+            flavour=asyncio,
+        )
     runtime.accept()
 
 
-async def _load_services(path: str):
+async def _load_services(
+    path: str,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = 60,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+):
     """
     Helper to load configured tasks once the runtime is ready and to hold objects alive
     """
-    with load(path):
+    with contextlib.ExitStack() as stack:
+        # services must not run before their state is restored
+        with ServiceUnit.hold():
+            content = stack.enter_context(
+                load(path, workers=workers, cache_dir=cache_dir)
+            )
+            if checkpoint is not None:
+                pipelines = pipeline_sections(
+                    next(
+                        section_content
+                        for plugin, section_content in content.items()
+                        if plugin.section == "pipeline"
+                    )
+                )
+                _restore_checkpoint(checkpoint, pipelines)
+        if checkpoint is not None:
+            _start_checkpoints(checkpoint, lambda: pipelines, checkpoint_interval)
         # sleep indefinitely to wait until the runtime is aborted
         await asyncio.sleep(float("inf"))
 
 
+async def _reload_services(
+    path: str,
+    checkpoint: Optional[str] = None,
+    checkpoint_interval: float = 60,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+):
+    """
+    Helper to load configured tasks and to reload them on ``SIGHUP``
+    """
+    configuration = ReloadableConfiguration(path, workers=workers, cache_dir=cache_dir)
+    # services must not run before their state is restored
+    with ServiceUnit.hold():
+        configuration.reload()
+        if checkpoint is not None:
+            _restore_checkpoint(
+                checkpoint,
+                {
+                    name: pipeline.content
+                    for name, pipeline in configuration.pipelines.items()
+                },
+            )
+    if checkpoint is not None:
+        _start_checkpoints(
+            checkpoint,
+            lambda: {
+                name: pipeline.content
+                for name, pipeline in configuration.pipelines.items()
+            },
+            checkpoint_interval,
+        )
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGHUP, _reload_configuration, configuration)
+    except (ValueError, RuntimeError) as err:
+        # signals are only available if the event loop runs in the main thread
+        logging.getLogger(__package__).warning(
+            "cannot reload configuration on SIGHUP: %s", err
+        )
+    try:
+        await asyncio.sleep(float("inf"))
+    finally:
+        loop.remove_signal_handler(signal.SIGHUP)
+
+
+def _restore_checkpoint(path: str, pipelines: Mapping[str, Sequence]):
+    """Restore ``pipelines`` from the checkpoint at ``path``"""
+    restored = read_checkpoint(path, pipelines)
+    logging.getLogger(__package__).info(
+        "Restored %d pipeline elements from checkpoint %s", restored, path
+    )
+
+
+def _start_checkpoints(
+    path: str, pipelines: Callable[[], Mapping[str, Sequence]], interval: float
+) -> Checkpointer:
+    """Periodically checkpoint ``pipelines`` to ``path``"""
+    checkpointer = Checkpointer(path, pipelines, interval=interval)
+    # store the latest state when the daemon shuts down
+    # this also keeps the checkpointer alive for the entire runtime
+    atexit.register(checkpointer.checkpoint)
+    return checkpointer
+
+
+def _reload_configuration(configuration: ReloadableConfiguration):
+    logger = logging.getLogger(__package__)
+    logger.info("Reloading configuration %s", configuration.config_path)
+    try:
+        configuration.reload()
+    except Exception:
+        logger.exception("Failed to reload configuration, keeping previous pipelines")
+
+
 def cli_run():
     """Run the daemon from a command line interface"""
     options = CLI.parse_args()
+    if options.check:
+        raise SystemExit(check(options.CONFIGURATION, cache_dir=options.config_cache))
     run(
         configuration=options.CONFIGURATION,
         level=options.log_level,
         target=options.log_target,
         short_format=options.log_journal,
+        log_queue=options.log_queue,
+        log_overflow=options.log_overflow,
+        trio_buffer=options.trio_buffer,
+        trio_guest=options.trio_guest,
+        thread_workers=options.thread_workers,
+        thread_queue=options.thread_queue,
+        event_loop=options.event_loop,
+        reload=options.reload,
+        checkpoint=options.checkpoint,
+        checkpoint_interval=options.checkpoint_interval,
+        config_workers=options.config_workers,
+        config_cache=options.config_cache,
     )
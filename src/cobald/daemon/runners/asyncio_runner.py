@@ -1,4 +1,4 @@
-from typing import Callable, Awaitable, Coroutine, Set
+from typing import Callable, Awaitable, Coroutine, Set, Iterable
 import asyncio
 
 from .base_runner import BaseRunner, OrphanedReturn
@@ -26,6 +26,9 @@ class AsyncioRunner(BaseRunner):
     def register_payload(self, payload: Callable[[], Awaitable]):
         self.asyncio_loop.call_soon_threadsafe(self._setup_payload, payload)
 
+    def register_payloads(self, *payloads: Callable[[], Awaitable]):
+        self.asyncio_loop.call_soon_threadsafe(self._setup_payloads, payloads)
+
     def run_payload(self, payload: Callable[[], Coroutine]):
         future = asyncio.run_coroutine_threadsafe(payload(), self.asyncio_loop)
         return future.result()
@@ -34,6 +37,10 @@ class AsyncioRunner(BaseRunner):
         task = self.asyncio_loop.create_task(self._monitor_payload(payload))
         self._tasks.add(task)
 
+    def _setup_payloads(self, payloads: Iterable[Callable[[], Awaitable]]):
+        for payload in payloads:
+            self._setup_payload(payload)
+
     async def _monitor_payload(self, payload: Callable[[], Awaitable]):
         try:
             result = await payload()
@@ -43,6 +50,8 @@ class AsyncioRunner(BaseRunner):
             failure = e
         else:
             if result is None:
+                # release finished payloads, e.g. of cancelled services
+                self._tasks.discard(asyncio.current_task())
                 return
             failure = OrphanedReturn(payload, result)
         self._tasks.discard(asyncio.current_task())
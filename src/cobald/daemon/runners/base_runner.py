@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Dict
 from abc import abstractmethod, ABCMeta
 import asyncio
 import logging
@@ -30,6 +30,24 @@ class BaseRunner(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def register_payloads(self, *payloads):
+        """
+        Register several ``payloads`` for background execution in a threadsafe manner
+
+        This is equivalent to :py:meth:`register_payload` for each payload,
+        but allows runners to submit all payloads at once.
+        """
+        for payload in payloads:
+            self.register_payload(payload)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Current metrics of the runner, such as the number of waiting payloads
+
+        The available metrics depend on the runner; by default, there are none.
+        """
+        return {}
+
     @abstractmethod
     def run_payload(self, payload):
         """
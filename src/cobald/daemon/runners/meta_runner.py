@@ -1,4 +1,4 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import logging
 import threading
 import warnings
@@ -13,18 +13,50 @@ from .thread_runner import ThreadRunner
 from ..debug import NameRepr
 
 
+#: event loops available for hosting all runners
+EVENT_LOOPS = ("asyncio", "uvloop", "auto")
+
+
+def _event_loop_policy(event_loop: str) -> Optional[asyncio.AbstractEventLoopPolicy]:
+    """Get the policy for an ``event_loop`` or :py:data:`None` for the default"""
+    if event_loop == "asyncio":
+        return None
+    elif event_loop in ("uvloop", "auto"):
+        try:
+            import uvloop
+        except ImportError:
+            if event_loop == "auto":
+                return None
+            raise
+        return uvloop.EventLoopPolicy()
+    raise ValueError(
+        "event loop must be one of %s, not %r"
+        % (", ".join(map(repr, EVENT_LOOPS)), event_loop)
+    )
+
+
 class MetaRunner(object):
     """
     Unified interface to schedule subroutines and coroutines for concurrent execution
+
+    :param event_loop: the :py:mod:`asyncio` event loop hosting all runners
+
+    The ``event_loop`` may be ``"asyncio"`` for the default event loop,
+    ``"uvloop"`` for the :py:mod:`uvloop` event loop, or
+    ``"auto"`` to use :py:mod:`uvloop` if it is available.
     """
 
     runner_types = (TrioRunner, AsyncioRunner, ThreadRunner)
 
-    def __init__(self):
+    def __init__(self, event_loop: str = "asyncio"):
         self._logger = logging.getLogger("cobald.runtime.runner.meta")
+        self._event_loop = event_loop
+        _event_loop_policy(event_loop)
         self._runners: Dict[ModuleType, BaseRunner] = {}
         # queue to store payloads submitted before the runner is started
         self._runner_queues: Dict[ModuleType, Any] = {}
+        # options passed to each runner when it is started
+        self._runner_options: Dict[ModuleType, Dict[str, Any]] = {}
         self.running = threading.Event()
 
     @property
@@ -38,6 +70,26 @@ class MetaRunner(object):
         )
         return self._runners
 
+    def configure_event_loop(self, event_loop: str):
+        """Set the ``event_loop`` hosting all runners; see :py:class:`MetaRunner`"""
+        if self.running.is_set():
+            raise RuntimeError("event loop cannot be configured while running")
+        _event_loop_policy(event_loop)
+        self._event_loop = event_loop
+
+    def configure_runner(self, flavour: ModuleType, **options):
+        """
+        Set ``options`` for the runner of ``flavour``
+
+        The ``options`` are passed as keyword arguments to the runner
+        when it is started. Runners cannot be configured while running.
+        """
+        if self.running.is_set():
+            raise RuntimeError("runners cannot be configured while running")
+        if not any(flavour == runner.flavour for runner in self.runner_types):
+            raise ValueError(f"unknown runner {NameRepr(flavour)}")
+        self._runner_options.setdefault(flavour, {}).update(options)
+
     def register_payload(self, *payloads, flavour: ModuleType):
         """Queue one or more payloads for execution after its runner is started"""
         try:
@@ -51,7 +103,19 @@ class MetaRunner(object):
                 self._logger.debug(
                     "registering payload %s (%s)", NameRepr(payload), NameRepr(flavour)
                 )
-                runner.register_payload(payload)
+            runner.register_payloads(*payloads)
+
+    def runner_metrics(self, flavour: ModuleType) -> Dict[str, float]:
+        """
+        Current metrics of the runner of ``flavour``
+
+        There are no metrics while the runner is not running.
+        """
+        try:
+            runner = self._runners[flavour]
+        except KeyError:
+            return {}
+        return runner.metrics()
 
     def run_payload(self, payload, *, flavour: ModuleType):
         """
@@ -65,6 +129,11 @@ class MetaRunner(object):
     def run(self):
         """Run all runners, blocking until completion or error"""
         self._logger.info("starting all runners")
+        policy = _event_loop_policy(self._event_loop)
+        default_policy = asyncio.get_event_loop_policy()
+        if policy is not None:
+            self._logger.info("using event loop policy %s", NameRepr(policy))
+            asyncio.set_event_loop_policy(policy)
         try:
             asyncio.run(self._manage_runners())
         except KeyboardInterrupt:
@@ -73,6 +142,8 @@ class MetaRunner(object):
             self._logger.exception("runner terminated: %s", err)
             raise RuntimeError("background task failed") from err
         finally:
+            if policy is not None:
+                asyncio.set_event_loop_policy(default_policy)
             self._logger.info("stopped all runners")
 
     def stop(self):
@@ -107,7 +178,9 @@ class MetaRunner(object):
         self._runners = {}
         runner_tasks = []
         for runner_type in self.runner_types:
-            runner = self._runners[runner_type.flavour] = runner_type(asyncio_loop)
+            runner = self._runners[runner_type.flavour] = runner_type(
+                asyncio_loop, **self._runner_options.get(runner_type.flavour, {})
+            )
             runner_tasks.append(asyncio_loop.create_task(runner.run()))
         for runner in self._runners.values():
             await runner.ready()
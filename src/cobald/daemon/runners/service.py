@@ -1,16 +1,34 @@
-from typing import TypeVar, Set
+from typing import (
+    TYPE_CHECKING,
+    TypeVar,
+    Set,
+    Dict,
+    Callable,
+    Any,
+    Optional,
+    Deque,
+    Iterator,
+    List,
+)
+from collections import deque
 import logging
 import weakref
 import trio
+import asyncio
 import functools
 import threading
+import contextlib
 
 from types import ModuleType
 
-from .meta_runner import MetaRunner
 from .guard import exclusive
 from ..debug import NameRepr
 
+# the runners are only needed once services are run,
+# importing them lazily speeds up importing services
+if TYPE_CHECKING:
+    from .meta_runner import MetaRunner
+
 
 T = TypeVar("T")
 
@@ -26,16 +44,32 @@ def _weakset_copy(ws: "weakref.WeakSet[T]") -> Set[T]:
 
 
 class ServiceUnit(object):
-    """
+    r"""
     Definition for running a service
 
     :param service: the service to run
     :param flavour: runner flavour to use for running the service
+
+    A unit may be :py:meth:`cancel`\ ed to stop its service while the
+    daemon keeps running.
     """
 
+    #: units that have been started
     __active_units__: "weakref.WeakSet[ServiceUnit]" = weakref.WeakSet()
+    #: units that have not been started yet, in order of definition
+    __pending_units__: "Deque[weakref.ref[ServiceUnit]]" = deque()
+    #: size of the pending queue at which defunct units are pruned
+    __pending_limit__ = 1024
+    #: callbacks notified whenever a new unit is defined
+    __unit_listeners__: "Set[Callable[[], Any]]" = set()
+    #: lists collecting units defined by each thread
+    __collectors__ = threading.local()
+    #: lists holding back units defined by each thread
+    __holders__ = threading.local()
 
     def __init__(self, service, flavour):
+        from .meta_runner import MetaRunner
+
         assert hasattr(service, "run"), "service must implement a 'run' method"
         assert any(
             flavour == runner.flavour for runner in MetaRunner.runner_types
@@ -45,24 +79,236 @@ class ServiceUnit(object):
         self.service = weakref.ref(service)
         self.flavour = flavour
         self._started = False
-        ServiceUnit.__active_units__.add(self)
+        self._cancelled = False
+        # thread-safe callback to cancel the running service
+        self._cancel_payload: Optional[Callable[[], Any]] = None
+        for collector in getattr(ServiceUnit.__collectors__, "stack", ()):
+            collector.append(self)
+        holders = getattr(ServiceUnit.__holders__, "stack", ())
+        if holders:
+            holders[-1].append(self)
+        else:
+            ServiceUnit._release(self)
+
+    @classmethod
+    def _release(cls, *units: "ServiceUnit"):
+        """Make ``units`` available for starting and notify all listeners"""
+        for unit in units:
+            cls.__pending_units__.append(weakref.ref(unit))
+        if len(cls.__pending_units__) >= cls.__pending_limit__:
+            cls._prune_pending()
+        for listener in cls.__unit_listeners__.copy():
+            listener()
+
+    @classmethod
+    def subscribe(cls, listener: "Callable[[], Any]"):
+        """
+        Call ``listener`` whenever a new unit is defined
+
+        The ``listener`` is called without arguments in the thread defining
+        the unit, after the unit has been added to :py:meth:`units`.
+        """
+        cls.__unit_listeners__ = {*cls.__unit_listeners__, listener}
+
+    @classmethod
+    def unsubscribe(cls, listener: "Callable[[], Any]"):
+        """Stop calling ``listener`` whenever a new unit is defined"""
+        cls.__unit_listeners__ = cls.__unit_listeners__ - {listener}
+
+    @classmethod
+    @contextlib.contextmanager
+    def collect(cls) -> "Iterator[List[ServiceUnit]]":
+        """
+        Collect all units defined by the current thread in the context
+
+        .. code:: python
+
+            with ServiceUnit.collect() as units:
+                pipeline = create_pipeline()
+            # stop the pipeline later on
+            for unit in units:
+                unit.cancel()
+        """
+        collectors = cls.__collectors__
+        if not hasattr(collectors, "stack"):
+            collectors.stack = []
+        units: "List[ServiceUnit]" = []
+        collectors.stack.append(units)
+        try:
+            yield units
+        finally:
+            collectors.stack.remove(units)
+
+    @classmethod
+    @contextlib.contextmanager
+    def hold(
+        cls, units: "Optional[List[ServiceUnit]]" = None
+    ) -> "Iterator[List[ServiceUnit]]":
+        """
+        Hold back all units defined by the current thread in the context
+
+        :param units: the held units of another hold to add units to
+
+        Held units are not started before the outermost hold ends. This allows
+        to prepare services, e.g. restoring their state, before they run.
+
+        .. code:: python
+
+            with ServiceUnit.hold():
+                pipeline = create_pipeline()
+                restore_pipeline(pipeline)
+            # the services of the pipeline may start now
+
+        To hold units defined by a helper thread, pass the units of the
+        :py:meth:`~.held` context of the owning thread as ``units``.
+        The owning hold releases these units once it ends.
+        """
+        holders = cls.__holders__
+        if not hasattr(holders, "stack"):
+            holders.stack = []
+        owned = units is None
+        units = [] if units is None else units
+        holders.stack.append(units)
+        try:
+            yield units
+        finally:
+            holders.stack.pop()
+            if owned and holders.stack:
+                holders.stack[-1].extend(units)
+            elif owned and units:
+                cls._release(*units)
+
+    @classmethod
+    def held(cls) -> "Optional[List[ServiceUnit]]":
+        """The units of the innermost hold of the current thread, if any"""
+        stack = getattr(cls.__holders__, "stack", None)
+        return stack[-1] if stack else None
 
     @classmethod
     def units(cls) -> "Set[ServiceUnit]":
         """Container of all currently defined units"""
-        return _weakset_copy(cls.__active_units__)
+        # copying the deque is GIL-atomic, just like copying the weakset data
+        pending = {
+            unit
+            for unit in (ref() for ref in tuple(cls.__pending_units__))
+            if unit is not None
+        }
+        return pending | _weakset_copy(cls.__active_units__)
+
+    @classmethod
+    def pending(cls) -> "Iterator[ServiceUnit]":
+        """
+        Consume all units that have not been started yet
+
+        Each unit is provided at most once, even if several threads consume
+        units concurrently. Units that are already running or whose service
+        has been garbage collected are skipped.
+        """
+        queue = cls.__pending_units__
+        while True:
+            try:
+                unit = queue.popleft()()
+            except IndexError:
+                return
+            if unit is not None and unit._pending:
+                yield unit
+
+    @classmethod
+    def _prune_pending(cls):
+        """Remove defunct units from the pending queue"""
+        queue = cls.__pending_units__
+        # rotate through the queue once, so that a concurrent consumer
+        # still receives each unit at most once
+        for _ in range(len(queue)):
+            try:
+                ref = queue.popleft()
+            except IndexError:
+                break
+            unit = ref()
+            if unit is not None and unit._pending:
+                queue.append(ref)
+        # prune only once the queue has grown again, to amortise the cost
+        cls.__pending_limit__ = max(1024, 2 * len(queue))
+
+    @property
+    def _pending(self) -> bool:
+        """Whether the unit may still be started"""
+        return not self._started and not self._cancelled and self.service() is not None
 
     @property
     def running(self):
         return self._started
 
-    def start(self, runner: MetaRunner):
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def start(self, runner: "MetaRunner"):
         service = self.service()
-        if service is None:
+        if service is None or self._cancelled:
             return
         else:
             self._started = True
-            runner.register_payload(service.run, flavour=self.flavour)
+            ServiceUnit.__active_units__.add(self)
+            if self.flavour is trio:
+                payload = functools.partial(self._run_trio, service.run)
+            elif self.flavour is asyncio:
+                payload = functools.partial(self._run_asyncio, service.run)
+            else:
+                payload = service.run
+            runner.register_payload(payload, flavour=self.flavour)
+
+    def cancel(self):
+        """
+        Thread-safely stop the service of this unit
+
+        A service that has not been started yet is never started.
+        A running :py:mod:`trio` or :py:mod:`asyncio` service is cancelled;
+        once its ``run`` method is done, the service is no longer referenced
+        by the daemon and may be garbage collected.
+        A running :py:mod:`threading` service cannot be cancelled.
+        """
+        if self._cancelled:
+            return
+        self._cancelled = True
+        if not self._started:
+            return
+        if self._cancel_payload is not None:
+            try:
+                self._cancel_payload()
+            except (trio.RunFinishedError, RuntimeError):
+                # the event loop running the service is already closed
+                pass
+        elif self.flavour is threading:
+            logging.getLogger("cobald.runtime.daemon.services").warning(
+                "cannot cancel running %s", NameRepr(self)
+            )
+        ServiceUnit.__active_units__.discard(self)
+
+    async def _run_trio(self, run):
+        with trio.CancelScope() as scope:
+            token = trio.lowlevel.current_trio_token()
+            self._cancel_payload = functools.partial(token.run_sync_soon, scope.cancel)
+            if self._cancelled:
+                scope.cancel()
+            try:
+                return await run()
+            finally:
+                self._cancel_payload = None
+
+    async def _run_asyncio(self, run):
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        self._cancel_payload = functools.partial(loop.call_soon_threadsafe, task.cancel)
+        try:
+            if self._cancelled:
+                return None
+            return await run()
+        except asyncio.CancelledError:
+            if not self._cancelled:
+                raise
+        finally:
+            self._cancel_payload = None
 
     def __repr__(self):
         return "%s(%r, flavour=%r)" % (
@@ -84,21 +330,19 @@ def service(flavour):
 
     For each service instance, its :py:class:`~.ServiceUnit` is available at
     ``service_instance.__service_unit__``.
+    The unit is only defined once the ``__init__`` of the Service class is done,
+    since the ``run`` method may be adopted immediately afterwards.
     """
 
     def service_unit_decorator(raw_cls):
-        __new__ = raw_cls.__new__
+        __init__ = raw_cls.__init__
 
-        def __new_service__(cls, *args, **kwargs):
-            if __new__ is object.__new__:
-                self = __new__(cls)
-            else:
-                self = __new__(cls, *args, **kwargs)
-            service_unit = ServiceUnit(self, flavour)
-            self.__service_unit__ = service_unit
-            return self
+        @functools.wraps(__init__)
+        def __init_service__(self, *args, **kwargs):
+            __init__(self, *args, **kwargs)
+            self.__service_unit__ = ServiceUnit(self, flavour)
 
-        raw_cls.__new__ = __new_service__
+        raw_cls.__init__ = __init_service__
         if raw_cls.run.__doc__ is None:
             raw_cls.run.__doc__ = "Service entry point"
         return raw_cls
@@ -119,16 +363,53 @@ class ServiceRunner(object):
     To provide ``async`` concurrency, the runner also manages common
     ``async`` event loops and tracks them for failures as well. As a result,
     ``async`` code should usually use the "current" event loop directly.
+
+    New services are adopted as soon as they are defined.
+    The ``accept_delay`` is no longer used and only kept for compatibility.
     """
 
     def __init__(self, accept_delay: float = 1):
         self._logger = logging.getLogger("cobald.runtime.daemon.services")
+        from .meta_runner import MetaRunner
+
         self._meta_runner = MetaRunner()
         self._must_shutdown = False
         self._is_shutdown = threading.Event()
         self._is_shutdown.set()
         self.running = threading.Event()
         self.accept_delay = accept_delay
+        # wakeup channel of the accept loop, valid only while it is running
+        self._accept_token: Optional[trio.lowlevel.TrioToken] = None
+        self._accept_event = trio.Event()
+        self._accept_pending = False
+
+    def configure_event_loop(self, event_loop: str):
+        """
+        Set the ``event_loop`` hosting all runners
+
+        The ``event_loop`` may be ``"asyncio"`` for the default event loop,
+        ``"uvloop"`` for the :py:mod:`uvloop` event loop, or
+        ``"auto"`` to use :py:mod:`uvloop` if it is available.
+        """
+        self._meta_runner.configure_event_loop(event_loop)
+
+    def configure_runner(self, flavour: ModuleType, **options):
+        r"""
+        Set ``options`` for the runner of ``flavour``
+
+        This must be called before the :py:class:`ServiceRunner` :py:meth:`accept`\ s
+        payloads. See the runner of each flavour for the available ``options``.
+        """
+        self._meta_runner.configure_runner(flavour, **options)
+
+    def runner_metrics(self, flavour: ModuleType) -> Dict[str, float]:
+        """
+        Current metrics of the runner of ``flavour``, such as its queue depth
+
+        See the runner of each flavour for the available metrics.
+        The metrics are empty while the runner is not running.
+        """
+        return self._meta_runner.runner_metrics(flavour)
 
     def execute(self, payload, *args, flavour: ModuleType, **kwargs):
         """
@@ -168,19 +449,23 @@ class ServiceRunner(object):
     def shutdown(self):
         """Shutdown the accept loop and stop running payloads"""
         self._must_shutdown = True
+        self._wakeup_accept()
         self._is_shutdown.wait()
         self._meta_runner.stop()
 
     async def _accept_services(self):
-        delay, max_delay, increase = 0.0, self.accept_delay, self.accept_delay / 10
         self._is_shutdown.clear()
+        self._accept_pending = False
+        self._accept_token = trio.lowlevel.current_trio_token()
+        ServiceUnit.subscribe(self._wakeup_accept)
         self.running.set()
         try:
             self._logger.info("%s started", self.__class__.__name__)
             while not self._must_shutdown:
+                # units defined after this point trigger a new wakeup
+                self._accept_event = trio.Event()
                 self._adopt_services()
-                await trio.sleep(delay)
-                delay = min(delay + increase, max_delay)
+                await self._accept_event.wait()
         except trio.Cancelled:
             self._logger.info("%s cancelled", self.__class__.__name__)
         except BaseException:
@@ -189,12 +474,30 @@ class ServiceRunner(object):
         else:
             self._logger.info("%s stopped", self.__class__.__name__)
         finally:
+            ServiceUnit.unsubscribe(self._wakeup_accept)
+            self._accept_token = None
             self.running.clear()
             self._is_shutdown.set()
 
+    def _wakeup_accept(self):
+        """Thread-safely wake up the accept loop to adopt new services"""
+        token = self._accept_token
+        # skip redundant wakeups if the accept loop has not woken up yet;
+        # since units are registered before notifying, the pending wakeup
+        # adopts them as well
+        if token is None or self._accept_pending:
+            return
+        self._accept_pending = True
+        try:
+            token.run_sync_soon(self._set_accept_event)
+        except trio.RunFinishedError:
+            self._accept_pending = False
+
+    def _set_accept_event(self):
+        self._accept_pending = False
+        self._accept_event.set()
+
     def _adopt_services(self):
-        for unit in ServiceUnit.units():
-            if unit.running:
-                continue
+        for unit in ServiceUnit.pending():
             self._logger.info("%s adopts %s", self.__class__.__name__, NameRepr(unit))
             unit.start(self._meta_runner)
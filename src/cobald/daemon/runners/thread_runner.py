@@ -1,15 +1,52 @@
+from typing import Optional, Callable, Any, Deque, Dict
+from collections import deque
 import threading
 import asyncio
 
+import trio
+
 from .base_runner import BaseRunner, OrphanedReturn
 
 
+def _in_event_loop() -> bool:
+    """Whether the current thread runs an :py:mod:`asyncio` or :py:mod:`trio` loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        return True
+    try:
+        trio.lowlevel.current_trio_token()
+    except RuntimeError:
+        return False
+    return True
+
+
 class ThreadRunner(BaseRunner):
     """
     Runner for subroutines with :py:mod:`threading`
 
+    :param max_workers: maximum number of threads executing payloads
+    :param max_queue: maximum number of payloads waiting for a thread
+
     Active payloads are *not* cancelled when the runner is closed.
     Only program termination forcefully cancels leftover payloads.
+
+    By default, every payload runs in a new thread.
+    If ``max_workers`` is set, payloads instead run in a pool of reusable threads,
+    started as needed up to ``max_workers``.
+    Payloads wait in a queue until a thread is available; if the queue holds
+    ``max_queue`` payloads, registering more payloads blocks until one is started.
+    A ``max_queue`` of ``0`` does not limit the queue.
+    Threads of the pool and threads running an :py:mod:`asyncio` or :py:mod:`trio`
+    event loop never block, since this could stall the pool or all payloads of
+    the event loop; payloads registered by them may exceed ``max_queue``.
+
+    .. note::
+
+        Payloads that never finish, such as the ``run`` method of services,
+        permanently occupy a thread of the pool.
     """
 
     flavour = threading
@@ -17,14 +54,82 @@ class ThreadRunner(BaseRunner):
     # This runner directly uses threading.Thread to run payloads.
     # To detect errors, each payload is wrapped; errors and unexpected return values
     # are pushed to a queue from which the main task re-raises.
-    def __init__(self, asyncio_loop: asyncio.AbstractEventLoop):
+    def __init__(
+        self,
+        asyncio_loop: asyncio.AbstractEventLoop,
+        max_workers: Optional[int] = None,
+        max_queue: int = 0,
+    ):
         super().__init__(asyncio_loop)
+        if max_workers is not None and max_workers <= 0:
+            raise ValueError("max_workers must be positive or None")
         self._payload_failure = asyncio_loop.create_future()
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        # Payloads and workers of the pool are guarded by a single lock.
+        # Idle workers are claimed by notifying them, so that each waiting
+        # payload either has a worker or a worker is started for it.
+        self._pool_lock = threading.Lock()
+        self._has_payload = threading.Condition(self._pool_lock)
+        self._has_capacity = threading.Condition(self._pool_lock)
+        self._payloads: Deque[Callable[[], Any]] = deque()
+        self._workers = 0
+        self._idle_workers = 0
+        self._closed = False
+        self._local = threading.local()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of payloads waiting for a thread"""
+        return len(self._payloads)
+
+    @property
+    def workers(self) -> int:
+        """Number of threads in the pool"""
+        return self._workers
+
+    @property
+    def idle_workers(self) -> int:
+        """Number of threads in the pool waiting for payloads"""
+        return self._idle_workers
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "queue_depth": self.queue_depth,
+            "workers": self.workers,
+            "idle_workers": self.idle_workers,
+        }
 
     def register_payload(self, payload):
-        thread = threading.Thread(
-            target=self._monitor_payload, args=(payload,), daemon=True
-        )
+        if self._max_workers is None:
+            thread = threading.Thread(
+                target=self._monitor_payload, args=(payload,), daemon=True
+            )
+            thread.start()
+            return
+        may_block = not getattr(self._local, "worker", False) and not _in_event_loop()
+        with self._pool_lock:
+            while (
+                may_block
+                and 0 < self._max_queue <= len(self._payloads)
+                and not self._closed
+            ):
+                self._has_capacity.wait()
+            if self._closed:
+                self._logger.warning(f"discarding payload {payload} during shutdown")
+                return
+            self._payloads.append(payload)
+            if self._idle_workers:
+                self._idle_workers -= 1
+                self._has_payload.notify()
+                return
+            elif self._workers >= self._max_workers:
+                self._logger.debug(
+                    "payload waiting for thread, queue depth %d", len(self._payloads)
+                )
+                return
+            self._workers += 1
+        thread = threading.Thread(target=self._work_payloads, daemon=True)
         thread.start()
 
     def run_payload(self, payload):
@@ -33,6 +138,21 @@ class ThreadRunner(BaseRunner):
         # this thread is blocked by running the payload directly.
         return payload()
 
+    def _work_payloads(self):
+        """Repeatedly fetch and execute payloads in a pooled thread"""
+        self._local.worker = True
+        while True:
+            with self._pool_lock:
+                while not self._payloads and not self._closed:
+                    self._idle_workers += 1
+                    self._has_payload.wait()
+                if self._closed:
+                    self._workers -= 1
+                    return
+                payload = self._payloads.popleft()
+                self._has_capacity.notify()
+            self._monitor_payload(payload)
+
     def _monitor_payload(self, payload):
         try:
             result = payload()
@@ -54,5 +174,15 @@ class ThreadRunner(BaseRunner):
     async def aclose(self):
         if self._stopped.is_set():
             return
+        self._close_pool()
         if not self._payload_failure.done():
             self._payload_failure.set_result(None)
+
+    def _close_pool(self):
+        """Discard waiting payloads and release idle threads"""
+        with self._pool_lock:
+            self._closed = True
+            self._payloads.clear()
+            self._idle_workers = 0
+            self._has_payload.notify_all()
+            self._has_capacity.notify_all()
@@ -1,5 +1,6 @@
-from typing import Optional, Callable, Awaitable, Coroutine
+from typing import Optional, Callable, Awaitable, Coroutine, Tuple
 import asyncio
+import math
 from functools import partial
 
 import trio
@@ -11,7 +12,27 @@ class TrioRunner(BaseRunner):
     """
     Runner for coroutines with :py:mod:`trio`
 
+    :param max_buffer_size: maximum number of payloads waiting to be started
+    :param guest: whether to run :py:mod:`trio` inside the :py:mod:`asyncio` loop
+
     All active payloads are actively cancelled when the runner is closed.
+
+    By default, payloads are accepted without limit.
+    If ``max_buffer_size`` is an integer, registering payloads from other threads
+    blocks until the runner has started enough payloads to buffer the new ones.
+    Payloads registered from inside the runner or from the :py:mod:`asyncio`
+    event loop are always started immediately.
+
+    By default, the :py:mod:`trio` event loop runs in a separate thread.
+    If ``guest`` is true, :py:mod:`trio` runs in `guest mode`_ inside the
+    :py:mod:`asyncio` event loop instead. This avoids moving payloads between
+    threads when :py:mod:`asyncio` and :py:mod:`trio` payloads interact.
+    In guest mode, payloads registered from the :py:mod:`asyncio` event loop
+    are always started immediately and :py:meth:`run_payload` may only be
+    called from other threads.
+
+    .. _`guest mode`: https://trio.readthedocs.io/en/stable/reference-lowlevel.html
+                      #using-guest-mode-to-run-trio-on-top-of-other-event-loops
     """
 
     flavour = trio
@@ -21,55 +42,137 @@ class TrioRunner(BaseRunner):
     # is used to move payloads into the trio loop.
     # Since the trio loop runs in its own thread, all public methods have to move
     # payloads/tasks into that thread.
-    def __init__(self, asyncio_loop: asyncio.AbstractEventLoop):
+    # Payloads registered from the asyncio thread never wait for the buffer:
+    # trio payloads may block the trio thread on asyncio payloads, e.g. via
+    # `runtime.execute(..., flavour=asyncio)`. Blocking the asyncio thread to
+    # wait for trio would then deadlock both loops; instead, payloads are
+    # scheduled for the trio loop without waiting. In guest mode, the trio loop
+    # runs in the asyncio thread itself, making this mandatory.
+    def __init__(
+        self,
+        asyncio_loop: asyncio.AbstractEventLoop,
+        max_buffer_size: float = math.inf,
+        guest: bool = False,
+    ):
+        if max_buffer_size != math.inf and (
+            not isinstance(max_buffer_size, int) or max_buffer_size < 0
+        ):
+            raise ValueError(
+                "max_buffer_size must be a non-negative integer or math.inf, not %r"
+                % (max_buffer_size,)
+            )
         super().__init__(asyncio_loop)
         self._ready = asyncio.Event()
+        self._max_buffer_size = max_buffer_size
+        self._guest = guest
         self._trio_token: Optional[trio.lowlevel.TrioToken] = None
         self._submit_tasks: Optional[trio.MemorySendChannel] = None
+        self._nursery: Optional[trio.Nursery] = None
 
     def register_payload(self, payload: Callable[[], Awaitable]):
+        self.register_payloads(payload)
+
+    def register_payloads(self, *payloads: Callable[[], Awaitable]):
         assert self._trio_token is not None and self._submit_tasks is not None
+        if self._in_host_thread():
+            self._trio_token.run_sync_soon(self._start_payloads, payloads)
+            return
+        # Moving into the trio thread is expensive, so we submit
+        # all payloads with a single call.
         try:
             trio.from_thread.run(
-                self._submit_tasks.send, payload, trio_token=self._trio_token
+                self._submit_payloads, payloads, trio_token=self._trio_token
             )
         except (trio.RunFinishedError, trio.Cancelled):
-            self._logger.warning(f"discarding payload {payload} during shutdown")
+            for payload in payloads:
+                self._logger.warning(f"discarding payload {payload} during shutdown")
             return
         except RuntimeError:
             # trio raises a bare RuntimeError when we are already in the trio thread
-            # just submit the task directly
-            self._submit_tasks.send_nowait(payload)
+            # just start the tasks directly – we cannot wait for the buffer
+            self._start_payloads(payloads)
+
+    def _start_payloads(self, payloads: Tuple[Callable[[], Awaitable], ...]):
+        """Start ``payloads`` from inside the trio thread"""
+        for payload in payloads:
+            try:
+                self._nursery.start_soon(self._monitor_payload, payload)
+            except RuntimeError:  # the nursery is closed
+                self._logger.warning(f"discarding payload {payload} during shutdown")
+
+    async def _submit_payloads(self, payloads: Tuple[Callable[[], Awaitable], ...]):
+        for payload in payloads:
+            await self._submit_tasks.send(payload)
 
     def run_payload(self, payload: Callable[[], Coroutine]):
         assert self._trio_token is not None and self._submit_tasks is not None
+        if self._guest and self._in_host_thread():
+            raise RuntimeError(
+                "cannot block the asyncio event loop to run a trio guest payload"
+            )
         return trio.from_thread.run(payload, trio_token=self._trio_token)
 
+    def _in_host_thread(self) -> bool:
+        """Whether the current thread runs the asyncio event loop"""
+        try:
+            return asyncio.get_running_loop() is self.asyncio_loop
+        except RuntimeError:
+            return False
+
     async def ready(self):
         await self._ready.wait()
+        if self._nursery is None:
+            raise RuntimeError("trio runner failed to start")
 
     async def manage_payloads(self):
         try:
-            await self.asyncio_loop.run_in_executor(None, self._run_trio_blocking)
-        except asyncio.CancelledError:
-            await self.aclose()
-            raise
+            if self._guest:
+                return await self._run_trio_guest()
+            try:
+                await self.asyncio_loop.run_in_executor(None, self._run_trio_blocking)
+            except asyncio.CancelledError:
+                await self.aclose()
+                raise
+        finally:
+            # do not leave anyone waiting if trio fails to start
+            self._ready.set()
 
     def _run_trio_blocking(self):
         return trio.run(self._manage_payloads_trio)
 
+    async def _run_trio_guest(self):
+        trio_done = self.asyncio_loop.create_future()
+        trio.lowlevel.start_guest_run(
+            self._manage_payloads_trio,
+            run_sync_soon_threadsafe=self.asyncio_loop.call_soon_threadsafe,
+            run_sync_soon_not_threadsafe=self.asyncio_loop.call_soon,
+            done_callback=trio_done.set_result,
+            host_uses_signal_set_wakeup_fd=True,
+        )
+        try:
+            trio_outcome = await asyncio.shield(trio_done)
+        except asyncio.CancelledError:
+            # the guest run is not bound to our task, we must wait for it explicitly
+            await self.aclose()
+            await trio_done
+            raise
+        return trio_outcome.unwrap()
+
     async def _manage_payloads_trio(self):
         self._trio_token = trio.lowlevel.current_trio_token()
-        # We receive tasks from a possibly blocking call in the same event loop
-        # To avoid deadlocking the event loop, the task buffer must always have
-        # sufficient capacity to accept new tasks.
+        # Tasks submitted from other threads may wait for buffer capacity.
+        # Tasks submitted from the trio thread bypass the buffer, since waiting
+        # for capacity would deadlock the trio event loop.
         self._submit_tasks, receive_tasks = trio.open_memory_channel(
-            max_buffer_size=float("inf")
+            max_buffer_size=self._max_buffer_size
         )
-        self.asyncio_loop.call_soon_threadsafe(self._ready.set)
         async with trio.open_nursery() as nursery:
+            self._nursery = nursery
+            self.asyncio_loop.call_soon_threadsafe(self._ready.set)
             async for task in receive_tasks:
                 nursery.start_soon(self._monitor_payload, task)
+                # do not keep the payload alive while waiting for the next one
+                del task
             # shutting down: cancel the scope to cancel all payloads
             nursery.cancel_scope.cancel()
 
@@ -17,13 +17,19 @@ class Buffer(PoolDecorator):
     Every ``window`` seconds, the final demand is applied to ``target``.
     """
 
-    demand = 0.0
+    __slots__ = ("window", "demand", "__service_unit__")
 
     def __init__(self, target: Pool, window: float = 10.0):
         super().__init__(target=target)
         self.window = window
         self.demand = target.demand
 
+    def __checkpoint__(self):
+        return {"demand": self.demand}
+
+    def __restore__(self, state):
+        self.demand = state["demand"]
+
     async def run(self):
         while True:
             if self.demand != self.target.demand:
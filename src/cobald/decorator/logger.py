@@ -81,6 +81,8 @@ class Logger(PoolDecorator):
         The ``consumption`` format field. Use ``allocation`` instead.
     """
 
+    __slots__ = ("_logger", "message", "level")
+
     @property
     def demand(self):
         return self.target.demand
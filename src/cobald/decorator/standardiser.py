@@ -39,6 +39,15 @@ class Standardiser(PoolDecorator):
     and ``minimum`` and ``maximum`` overrule all other limits.
     """
 
+    __slots__ = (
+        "_demand",
+        "minimum",
+        "maximum",
+        "granularity",
+        "surplus",
+        "backlog",
+    )
+
     @property
     def demand(self) -> float:
         if abs(self._demand - self.target.demand) >= self.granularity:
@@ -84,3 +93,10 @@ class Standardiser(PoolDecorator):
         self.granularity = granularity
         self.surplus = surplus
         self.backlog = backlog
+
+    def __checkpoint__(self):
+        return {"demand": self._demand}
+
+    def __restore__(self, state):
+        # the demand is tied to that of the target, so it must be applied
+        self.demand = state["demand"]
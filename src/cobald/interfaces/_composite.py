@@ -9,6 +9,8 @@ class CompositePool(Pool):
     Concatenation of multiple providers for a number of indistinguishable resources
     """
 
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def supply(self):
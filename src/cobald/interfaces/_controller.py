@@ -3,18 +3,21 @@ import abc
 
 from ._pool import Pool
 from ._partial import Partial
+from ._target import Targeting
 
 
 C = TypeVar("C", bound="Controller")
 
 
-class Controller(metaclass=abc.ABCMeta):  # noqa: B024
+class Controller(Targeting, metaclass=abc.ABCMeta):  # noqa: B024
     """
     Controller adjusting the demand in a :py:class:`~.Pool`
 
     :param target: the resource pool for which demand is adjusted
     """
 
+    __slots__ = ("__weakref__",)
+
     def __init__(self, target: Pool):
         self.target = target
 
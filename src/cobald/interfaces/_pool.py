@@ -15,6 +15,8 @@ class Pool(metaclass=abc.ABCMeta):
     Individual provider for a number of indistinguishable resources
     """
 
+    __slots__ = ("__weakref__",)
+
     @property
     @abc.abstractmethod
     def supply(self) -> float:
@@ -2,18 +2,21 @@ from ._pool import Pool
 from typing import TypeVar, Type
 
 from ._partial import Partial
+from ._target import Targeting
 
 
 C = TypeVar("C", bound="PoolDecorator")
 
 
-class PoolDecorator(Pool):
+class PoolDecorator(Pool, Targeting):
     """
     Decorator modifying how a pool provides resources
 
     :param target: the resource pool for which demand is adjusted
     """
 
+    __slots__ = ()
+
     def __init__(self, target: Pool):
         self.target = target
 
@@ -0,0 +1,10 @@
+class Targeting(object):
+    """
+    Common base of all interfaces which act on a ``target``
+
+    The ``target`` is stored in a slot of this class only. This allows
+    to combine several interfaces, such as a :py:class:`~.Controller`
+    and a :py:class:`~.PoolDecorator`, without conflicting slots.
+    """
+
+    __slots__ = ("target",)
@@ -1,6 +1,7 @@
 from collections.abc import Mapping
-from logging import Formatter, LogRecord
-from typing import Dict, Set, Union, Any, TypeVar
+import threading
+from logging import Formatter, LogRecord, StreamHandler, FileHandler
+from typing import Dict, Set, Union, Any, TypeVar, Tuple, Optional
 
 from .format_json import RECORD_ATTRIBUTES
 
@@ -50,12 +51,112 @@ def line_protocol(
     return output_str + "\n"
 
 
+class _FieldAccumulator(object):
+    """Summary of the values of a field during one period"""
+
+    __slots__ = ("last", "min", "max", "total", "count")
+
+    def __init__(self, value):
+        self.last = self.min = self.max = value
+        self.total = value if _is_number(value) else 0
+        self.count = 1 if _is_number(value) else 0
+
+    def add(self, value):
+        self.last = value
+        if _is_number(value):
+            self.min = min(self.min, value) if _is_number(self.min) else value
+            self.max = max(self.max, value) if _is_number(self.max) else value
+            self.total += value
+            self.count += 1
+
+    def result(self, aggregate: str):
+        # non-numerical values cannot be aggregated, we report the last seen instead
+        if aggregate == "last" or not _is_number(self.last):
+            return self.last
+        elif aggregate == "min":
+            return self.min
+        elif aggregate == "max":
+            return self.max
+        else:
+            return self.total / self.count
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _BucketAggregator(object):
+    """
+    Aggregation of reports into one report per time bucket
+
+    :param aggregate: how to aggregate numerical fields per bucket
+
+    Reports are identified by their name, tags and timestamp bucket.
+    A bucket is completed once a report for a later bucket is added.
+    Since completed buckets have already been provided, reports that arrive
+    late for a completed bucket are added to the newest bucket instead.
+    """
+
+    def __init__(self, aggregate: str):
+        self.aggregate = aggregate
+        self._lock = threading.Lock()
+        self._newest: Optional[float] = None
+        self._buckets: Dict[
+            Tuple[float, str, Tuple[Tuple[str, Any], ...]],
+            Dict[str, _FieldAccumulator],
+        ] = {}
+
+    def add(self, name: str, tags: dict, fields: dict, timestamp: float) -> str:
+        """Add a report and provide the line protocol of all completed buckets"""
+        output = ""
+        with self._lock:
+            if self._newest is None or timestamp > self._newest:
+                if self._newest is not None:
+                    output = self._flush(before=timestamp)
+                self._newest = timestamp
+            else:
+                timestamp = self._newest
+            accumulators = self._buckets.setdefault(
+                (timestamp, name, tuple(sorted(tags.items()))), {}
+            )
+            for key, value in fields.items():
+                try:
+                    accumulators[key].add(value)
+                except KeyError:
+                    accumulators[key] = _FieldAccumulator(value)
+        return output
+
+    def flush(self) -> str:
+        """Provide the line protocol of all buckets, including incomplete ones"""
+        with self._lock:
+            return self._flush(before=float("inf"))
+
+    def _flush(self, before: float) -> str:
+        aggregate = self.aggregate
+        completed = [key for key in self._buckets if key[0] < before]
+        output = ""
+        for key in completed:
+            timestamp, name, tags = key
+            accumulators = self._buckets.pop(key)
+            output += line_protocol(
+                name=name,
+                tags=dict(tags),
+                fields={
+                    field: accumulator.result(aggregate)
+                    for field, accumulator in accumulators.items()
+                },
+                timestamp=timestamp,
+            )
+        return output
+
+
 class LineProtocolFormatter(Formatter):
     """
     Formatter that emits data as InfluxDB Line Protocol
 
     :param tags: record data to use as tags
     :param resolution: resolution of timestamps in seconds
+    :param aggregate: how to aggregate records with the same timestamp
 
     The ``tags`` act as a whitelist for record keys if they are an iterable.
     When a dictionary is supplied, its values act as default values if the
@@ -66,18 +167,48 @@ class LineProtocolFormatter(Formatter):
     timestamps 10, 20, 30, ...
     If ``resolution`` is ``None`` the timestamp is omitted from the Line Protocol
     and Telegraf will take care on setting the current timestamp.
+
+    By default, every record is formatted as a separate line even if several
+    records have the same timestamp.
+    Setting ``aggregate`` to ``"last"``, ``"min"``, ``"max"`` or ``"mean"`` instead
+    summarises all records with the same message, tags and timestamp to one line.
+    The numerical fields of the line are then the last, minimum, maximum
+    or mean value of each field; other fields always use the last value.
+    Aggregation requires a ``resolution``.
+
+    When aggregating, each line is emitted only once a record with a later
+    timestamp is formatted; in the meantime, records are formatted as an
+    empty string. Use :py:meth:`flush` to get the lines of pending records.
+    Records arriving after the line of their timestamp has been emitted,
+    for example from concurrent threads, are aggregated with the newest
+    pending records instead of emitting a duplicate line.
+    The :py:class:`~.LineProtocolStreamHandler` and
+    :py:class:`~.LineProtocolFileHandler` do not write empty output
+    and write all pending lines when they are closed.
     """
 
     def __init__(
         self,
         tags: Union[Dict[str, Any], Set[str], None] = None,
         resolution: float = None,
+        aggregate: Optional[str] = None,
     ):
         super().__init__()
         self._default_tags = tags if isinstance(tags, Mapping) else {}
         self._tags_whitelist = set(tags) if tags is not None else set()
         self._fields_blacklist = self._tags_whitelist | set(RECORD_ATTRIBUTES)
         self._resolution = resolution
+        if aggregate is None:
+            self._aggregator = None
+        elif aggregate not in ("last", "min", "max", "mean"):
+            raise ValueError(
+                "aggregate must be one of 'last', 'min', 'max' or 'mean', not %r"
+                % aggregate
+            )
+        elif resolution is None:
+            raise ValueError("aggregate requires a resolution")
+        else:
+            self._aggregator = _BucketAggregator(aggregate)
 
     def format(self, record: LogRecord) -> str:
         args = record.args
@@ -105,10 +236,59 @@ class LineProtocolFormatter(Formatter):
             if self._resolution is not None
             else None
         )
+        if self._aggregator is not None:
+            return self._aggregator.add(
+                name=record.message, tags=tags, fields=fields, timestamp=timestamp
+            )
         return line_protocol(
             name=record.message, tags=tags, fields=fields, timestamp=timestamp
         )
 
+    def flush(self) -> str:
+        """Format all records withheld for aggregation"""
+        if self._aggregator is None:
+            return ""
+        return self._aggregator.flush()
+
+
+class _LineProtocolOutput(object):
+    """Output of :py:class:`~.LineProtocolFormatter` lines by a handler"""
+
+    # every line already ends with a newline,
+    # and records withheld for aggregation do not produce any output
+    terminator = ""
+
+    def close(self):
+        self.acquire()
+        try:
+            formatter = self.formatter
+            if isinstance(formatter, LineProtocolFormatter):
+                pending = formatter.flush()
+                if pending and self.stream is not None:
+                    self.stream.write(pending)
+                    self.stream.flush()
+        finally:
+            self.release()
+        super().close()
+
+
+class LineProtocolStreamHandler(_LineProtocolOutput, StreamHandler):
+    """
+    Handler writing :py:class:`~.LineProtocolFormatter` lines to a stream
+
+    Lines of records withheld for aggregation are written on :py:meth:`close`,
+    which :py:mod:`logging` does for all handlers when the program exits.
+    """
+
+
+class LineProtocolFileHandler(_LineProtocolOutput, FileHandler):
+    """
+    Handler writing :py:class:`~.LineProtocolFormatter` lines to a file
+
+    Lines of records withheld for aggregation are written on :py:meth:`close`,
+    which :py:mod:`logging` does for all handlers when the program exits.
+    """
+
 
 if __name__ == "__main__":
     import logging
@@ -0,0 +1,181 @@
+r"""
+Lightweight reporting of monitoring data without :py:mod:`logging`
+
+Each report is a compact :py:class:`~.Report` tuple of a name, tags, fields
+and a timestamp. Reports are passed directly to all :py:class:`~.Sink`\ s of
+a :py:class:`~.Telemetry` channel, without creating or formatting any
+:py:class:`logging.LogRecord`.
+
+.. code:: python
+
+    from cobald.monitor.telemetry import telemetry, StreamSink
+
+    telemetry.add_sink(StreamSink(sys.stdout))
+    telemetry.report("forecast", {"temperature": 298}, {"city": "Karlsruhe"})
+"""
+
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, TextIO
+import abc
+import json
+import logging
+import threading
+import time
+
+from .format_line import line_protocol
+
+
+class Report(NamedTuple):
+    """A single report of monitoring data"""
+
+    #: identifier of the report, e.g. the InfluxDB measurement
+    name: str
+    #: data identifying the specific report
+    tags: Mapping[str, Any]
+    #: measurements of the report
+    fields: Mapping[str, Any]
+    #: when the measurement was taken, in seconds since the epoch
+    timestamp: float
+
+
+_NO_TAGS: Dict[str, Any] = {}
+
+
+def line_format(report: Report) -> str:
+    """Format a report as per InfluxDB line protocol"""
+    return line_protocol(*report)
+
+
+def json_format(report: Report) -> str:
+    """Format a report as a single line of JSON"""
+    return (
+        json.dumps(
+            {
+                "name": report.name,
+                "tags": report.tags,
+                "fields": report.fields,
+                "time": report.timestamp,
+            }
+        )
+        + "\n"
+    )
+
+
+class Sink(metaclass=abc.ABCMeta):
+    r"""Destination for :py:class:`~.Report`\ s of a :py:class:`~.Telemetry`"""
+
+    @abc.abstractmethod
+    def emit(self, report: Report) -> None:
+        """Process a single ``report``"""
+        raise NotImplementedError
+
+    def flush(self) -> None:  # noqa: B027
+        """Ensure all processed reports have been written"""
+
+
+class StreamSink(Sink):
+    """
+    Sink writing formatted reports to a stream
+
+    :param stream: the stream to write to
+    :param format: callable converting a :py:class:`~.Report` to text
+    """
+
+    def __init__(self, stream: TextIO, format: Callable[[Report], str] = line_format):
+        self.stream = stream
+        self.format = format
+        self._lock = threading.Lock()
+
+    def emit(self, report: Report) -> None:
+        output = self.format(report)
+        with self._lock:
+            self.stream.write(output)
+
+    def flush(self) -> None:
+        with self._lock:
+            self.stream.flush()
+
+
+class LoggingSink(Sink):
+    """
+    Sink forwarding reports to :py:mod:`logging`
+
+    :param name: name of the :py:class:`logging.Logger` to log to
+    :param level: numerical logging level
+
+    Each report is logged in the format expected by the formatters of
+    :py:mod:`cobald.monitor`, with the report name as the message and
+    tags and fields as the data.
+    This allows to use existing :py:mod:`logging` configurations, at the
+    cost of creating and formatting a :py:class:`logging.LogRecord` per report.
+    The timestamp of the record is the time of logging, not of the report.
+    """
+
+    def __init__(self, name: str = "cobald.monitor", level: int = logging.INFO):
+        self._logger = logging.getLogger(name)
+        self.level = level
+
+    def emit(self, report: Report) -> None:
+        self._logger.log(self.level, report.name, {**report.tags, **report.fields})
+
+
+class Telemetry(object):
+    """
+    Channel dispatching monitoring reports to several sinks
+
+    :param sinks: initial sinks receiving reports
+
+    If a channel has no sinks, reporting is a no-op.
+    """
+
+    def __init__(self, *sinks: Sink):
+        self._sinks: List[Sink] = list(sinks)
+
+    @property
+    def sinks(self):
+        return tuple(self._sinks)
+
+    def add_sink(self, sink: Sink) -> None:
+        """Add a ``sink`` to receive all future reports"""
+        # replace the list instead of modifying it, so that
+        # concurrent calls to ``report`` can iterate it without locking
+        self._sinks = [*self._sinks, sink]
+
+    def remove_sink(self, sink: Sink) -> None:
+        """Remove a ``sink`` from receiving reports"""
+        self._sinks = [other for other in self._sinks if other is not sink]
+
+    def report(
+        self,
+        name: str,
+        fields: Mapping[str, Any],
+        tags: Optional[Mapping[str, Any]] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Report monitoring data to all sinks
+
+        :param name: identifier of the report
+        :param fields: measurements of the report
+        :param tags: data identifying the specific report
+        :param timestamp: when the measurement was taken, defaults to now
+        """
+        sinks = self._sinks
+        if not sinks:
+            return
+        report = Report(
+            name,
+            _NO_TAGS if tags is None else tags,
+            fields,
+            time.time() if timestamp is None else timestamp,
+        )
+        for sink in sinks:
+            sink.emit(report)
+
+    def flush(self) -> None:
+        """Flush all sinks"""
+        for sink in self._sinks:
+            sink.flush()
+
+
+#: The default channel for monitoring data
+telemetry = Telemetry()
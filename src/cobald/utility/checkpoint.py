@@ -0,0 +1,56 @@
+"""
+Protocol for storing and restoring the state of pipeline elements
+
+Objects supporting checkpoints implement two methods:
+
+``__checkpoint__(self)``
+    Provide the current state of the object.
+    The state must be serialisable as JSON.
+
+``__restore__(self, state)``
+    Restore the object to a previous ``state``.
+
+Elements that aggregate other elements, such as composites, should
+include the state of their children in their own state.
+"""
+
+from typing import Any, Optional
+
+
+def get_state(obj) -> Optional[Any]:
+    """Get the checkpoint state of ``obj`` or :py:data:`None` if not supported"""
+    try:
+        checkpoint = obj.__checkpoint__
+    except AttributeError:
+        return None
+    return checkpoint()
+
+
+def set_state(obj, state: Optional[Any]) -> None:
+    """Restore ``obj`` to a checkpoint ``state`` if supported"""
+    if state is None:
+        return
+    try:
+        restore = obj.__restore__
+    except AttributeError:
+        return
+    restore(state)
+
+
+def get_children_state(children) -> list:
+    """Get the checkpoint state of several ``children``"""
+    return [get_state(child) for child in children]
+
+
+def set_children_state(children, states: list) -> None:
+    """
+    Restore several ``children`` to their checkpoint ``states``
+
+    If the number of children has changed, the ``states`` are ignored
+    as they cannot be matched to the current children.
+    """
+    children = list(children)
+    if len(children) != len(states):
+        return
+    for child, state in zip(children, states):
+        set_state(child, state)